@@ -0,0 +1,122 @@
+import math
+from collections import deque
+from statistics import NormalDist
+import numpy as np
+
+
+class CountAggregator:
+    """
+    Sliding-window statistics over per-frame shrimp counts.
+
+    Counts are small non-negative integers, so the window is kept as a
+    ring buffer plus a histogram of count values. Adding a frame is O(1);
+    median, trimmed mean and the median's confidence interval are read
+    from the histogram in O(max count), independent of the window length
+    or how many frames the session has seen.
+    """
+
+    def __init__(self, window=300, trim=0.1, confidence=0.95):
+        self.window = window
+        self.trim = trim
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.reset()
+
+    def reset(self):
+        self.values = deque(maxlen=self.window)
+        self.bins = np.zeros(64, dtype=np.int64)
+        self.total = 0
+        self.total_sq = 0
+        self.frames = 0  # frames seen since reset, including evicted ones
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, count):
+        count = max(0, int(count))
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.bins[old] -= 1
+            self.total -= old
+            self.total_sq -= old * old
+        if count >= len(self.bins):
+            grown = np.zeros(max(count + 1, 2 * len(self.bins)), dtype=np.int64)
+            grown[:len(self.bins)] = self.bins
+            self.bins = grown
+
+        self.values.append(count)
+        self.bins[count] += 1
+        self.total += count
+        self.total_sq += count * count
+        self.frames += 1
+
+    # ---------------------------------------------------------------
+    # Order statistics from the histogram
+    # ---------------------------------------------------------------
+    def _kth(self, k):
+        """k-th smallest count in the window (0-based)."""
+        return int(np.searchsorted(np.cumsum(self.bins), k + 1))
+
+    def _sum_smallest(self, m):
+        """Sum of the m smallest counts in the window."""
+        if m <= 0:
+            return 0
+        cum = np.cumsum(self.bins)
+        idx = int(np.searchsorted(cum, m))
+        below = int(cum[idx - 1]) if idx > 0 else 0
+        full = int(np.dot(np.arange(idx), self.bins[:idx]))
+        return full + (m - below) * idx
+
+    # ---------------------------------------------------------------
+    # Summary statistics
+    # ---------------------------------------------------------------
+    def mean(self):
+        n = len(self.values)
+        return self.total / n if n else 0.0
+
+    def std(self):
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        var = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def median(self):
+        n = len(self.values)
+        if not n:
+            return 0.0
+        if n % 2:
+            return float(self._kth(n // 2))
+        return (self._kth(n // 2 - 1) + self._kth(n // 2)) / 2
+
+    def trimmed_mean(self):
+        n = len(self.values)
+        g = int(self.trim * n)
+        if n - 2 * g <= 0:
+            return self.median()
+        return (self._sum_smallest(n - g) - self._sum_smallest(g)) / (n - 2 * g)
+
+    def confidence_interval(self):
+        """
+        Distribution-free confidence interval for the median: order statistics
+        k..n-k+1 (1-based), symmetric around the middle rank.
+        """
+        n = len(self.values)
+        if not n:
+            return 0, 0
+        half = self.z * math.sqrt(n) / 2
+        lo = max(0, math.floor(n / 2 - half) - 1)
+        hi = min(n - 1, n - 1 - lo)
+        return self._kth(lo), self._kth(hi)
+
+    def summary(self):
+        lo, hi = self.confidence_interval()
+        return {
+            "frames": self.frames,
+            "window": len(self.values),
+            "median": self.median(),
+            "trimmed_mean": self.trimmed_mean(),
+            "mean": self.mean(),
+            "std": self.std(),
+            "ci_low": lo,
+            "ci_high": hi,
+        }
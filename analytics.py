@@ -0,0 +1,67 @@
+import datetime
+from database import get_conn
+
+
+# ------------------------
+# Biomass Analytics
+# ------------------------
+# All queries read the biomass_daily rollup (one row per user per day, kept
+# current by triggers on biomass_records), so their cost depends on the
+# number of days asked for, not on how many raw records exist.
+
+def _day(offset_days=0):
+    return (datetime.date.today() - datetime.timedelta(days=offset_days)).isoformat()
+
+
+def daily_totals(owner_id, days=14):
+    """[(day, records, total count, total biomass, total feed, avg count)] for the last `days` days."""
+    return get_conn().execute("""
+        SELECT day, records, totalCount, totalBiomass, totalFeed,
+               CAST(totalCount AS REAL) / records
+        FROM biomass_daily
+        WHERE ownerId=? AND day>=?
+        ORDER BY day DESC
+    """, (owner_id, _day(days - 1))).fetchall()
+
+
+def weekly_totals(owner_id, weeks=8):
+    """Same columns as daily_totals, bucketed by the Monday that starts each week."""
+    return get_conn().execute("""
+        SELECT date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days') AS week,
+               SUM(records), SUM(totalCount), SUM(totalBiomass), SUM(totalFeed),
+               CAST(SUM(totalCount) AS REAL) / SUM(records)
+        FROM biomass_daily
+        WHERE ownerId=? AND day>=?
+        GROUP BY week
+        ORDER BY week DESC
+    """, (owner_id, _day(weeks * 7 - 1))).fetchall()
+
+
+def _window(owner_id, start_offset, end_offset):
+    return get_conn().execute("""
+        SELECT COALESCE(SUM(records), 0), COALESCE(SUM(totalCount), 0),
+               COALESCE(SUM(totalBiomass), 0), COALESCE(SUM(totalFeed), 0)
+        FROM biomass_daily
+        WHERE ownerId=? AND day>=? AND day<=?
+    """, (owner_id, _day(start_offset), _day(end_offset))).fetchone()
+
+
+def summary(owner_id, period_days=7):
+    """
+    Totals for the current period and the change in average count against
+    the period before it (None when there is nothing to compare).
+    """
+    records, count, biomass, feed = _window(owner_id, period_days - 1, 0)
+    prev_records, prev_count, _, _ = _window(owner_id, 2 * period_days - 1, period_days)
+
+    avg = count / records if records else 0.0
+    prev_avg = prev_count / prev_records if prev_records else None
+    trend = (avg - prev_avg) / prev_avg * 100 if prev_avg else None
+    return {
+        "records": records,
+        "total_count": count,
+        "total_biomass": biomass,
+        "total_feed": feed,
+        "avg_count": avg,
+        "avg_count_trend_pct": trend,
+    }
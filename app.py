@@ -1,7 +1,31 @@
 import sys
 from PyQt5 import QtWidgets, QtCore
-from database import init_db, verify_user
+from database import init_db, verify_user, close_conn, close_mongo_client
 from ui_main import MainMenu
+from detector import preload_detector
+from sync_service import start_sync_service, stop_sync_service
+from metrics import start_metrics_writer, stop_metrics_writer
+
+class LoginWorker(QtCore.QThread):
+    """Runs the (bcrypt-heavy, possibly networked) credential check off the GUI thread."""
+    done = QtCore.pyqtSignal(object)  # user id or None
+
+    def __init__(self, username, password):
+        super().__init__()
+        self.username = username
+        self.password = password
+
+    def run(self):
+        uid = None
+        try:
+            uid = verify_user(self.username, self.password)
+        except Exception as e:
+            # e.g. a SQLite error or a malformed cached hash; never leave the dialog waiting
+            print("Login check error:", e)
+        finally:
+            close_conn()
+            self.done.emit(uid)
+
 
 class Login(QtWidgets.QDialog):
     def __init__(self):
@@ -26,7 +50,7 @@ class Login(QtWidgets.QDialog):
         self.info = QtWidgets.QLabel("")
         self.info.setStyleSheet("font-size:22px; color:red;")
 
-        btn = QtWidgets.QPushButton("Login")
+        self.btn = btn = QtWidgets.QPushButton("Login")
         btn.setFixedHeight(80)
         btn.setStyleSheet("""
             QPushButton {
@@ -46,6 +70,7 @@ class Login(QtWidgets.QDialog):
         layout.addWidget(self.info)
 
         self.user_id = None
+        self.worker = None
 
     def try_login(self):
         username = self.user.text().strip()
@@ -54,7 +79,18 @@ class Login(QtWidgets.QDialog):
             self.info.setText("Please enter username and password.")
             return
 
-        uid = verify_user(username, password)
+        if self.worker is not None:
+            return  # a check is already running
+        self.btn.setEnabled(False)
+        self.info.setText("Checking credentials...")
+        self.worker = LoginWorker(username, password)
+        self.worker.done.connect(self.on_login_result)
+        self.worker.start()
+
+    def on_login_result(self, uid):
+        self.worker.wait()
+        self.worker = None
+        self.btn.setEnabled(True)
         if uid:
             self.user_id = uid
             self.accept()  # proceed to main menu
@@ -64,6 +100,9 @@ class Login(QtWidgets.QDialog):
 def main():
     init_db()
     app = QtWidgets.QApplication(sys.argv)
+    preload_detector()  # parse/optimize the model while the login screen is up
+    start_sync_service()
+    start_metrics_writer()
 
     while True:
         login = Login()
@@ -79,6 +118,10 @@ def main():
         if not getattr(main_window, "logout_requested", False):
             break
 
+    stop_sync_service()
+    stop_metrics_writer()
+    close_mongo_client()
+    close_conn()
     sys.exit()
 
 if __name__ == "__main__":
@@ -0,0 +1,250 @@
+import os
+import sys
+import csv
+import time
+import sqlite3
+import datetime
+import argparse
+import multiprocessing as mp
+import cv2
+
+from camera import ReplayCamera
+from detector import ShrimpDetector, load_detector_config
+
+# Offline recount of archived pond videos / image dumps. Example:
+#   python batch_count.py recordings/ dumps/day3 --workers 4 --threads 1 --out counts.csv
+#   python batch_count.py pond1.mp4 --conf 0.3 --every 5 --out counts.db
+# Inputs are split into chunks (frame ranges of a video, or runs of image
+# files) that a process pool counts independently; each worker owns one ONNX
+# session. Counts are written as chunks finish, so memory stays bounded by
+# workers x batch size however long the input is.
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".m4v", ".mpg", ".mpeg", ".h264")
+
+
+# ---------------------------------------------------------------
+# Work planning: (source, kind, payload) chunks
+# ---------------------------------------------------------------
+def expand_inputs(paths):
+    """Yield ("video", path) for video files and ("images", path) for image folders or files."""
+    for path in paths:
+        if os.path.isdir(path):
+            entries = sorted(os.listdir(path))
+            if any(e.lower().endswith(ReplayCamera.IMAGE_EXTS) for e in entries):
+                yield "images", path
+            for e in entries:
+                full = os.path.join(path, e)
+                if os.path.isdir(full) or e.lower().endswith(VIDEO_EXTS):
+                    yield from expand_inputs([full])
+        elif path.lower().endswith(ReplayCamera.IMAGE_EXTS):
+            yield "images", path
+        else:
+            yield "video", path
+
+
+def plan_chunks(paths, chunk):
+    """Split every input into independent chunks of at most `chunk` frames."""
+    for kind, path in expand_inputs(paths):
+        if kind == "images":
+            files = ReplayCamera(path).images if os.path.isdir(path) else [path]
+            for i in range(0, len(files), chunk):
+                yield path, kind, (i, files[i:i + chunk])
+            continue
+
+        cap = cv2.VideoCapture(path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+        cap.release()
+        if total <= 0:
+            yield path, kind, (0, None)  # length unknown: one worker reads it all
+            continue
+        for start in range(0, total, chunk):
+            yield path, kind, (start, min(start + chunk, total))
+
+
+def read_chunk(source, kind, payload, every):
+    """Yield (frame_index, frame) for one chunk, keeping every `every`-th frame."""
+    if kind == "images":
+        first, files = payload
+        for i, f in enumerate(files, start=first):
+            if i % every:
+                continue
+            frame = cv2.imread(f)
+            if frame is None:
+                print(f"Skipping unreadable image: {f}", file=sys.stderr)
+                continue
+            yield i, frame
+        return
+
+    start, stop = payload
+    cap = cv2.VideoCapture(source)
+    try:
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        idx = start
+        while stop is None or idx < stop:
+            if idx % every:
+                if not cap.grab():  # skipped frames are never decoded into images
+                    break
+            else:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                yield idx, frame
+            idx += 1
+    finally:
+        cap.release()
+
+
+# ---------------------------------------------------------------
+# Worker process: one detector (ONNX session) per process
+# ---------------------------------------------------------------
+_worker = None
+_worker_error = None
+
+
+def load_detector(model, conf, imgsz, threads, precision=None):
+    """Detector for one process: `threads` intra-op threads, no optimized-graph cache."""
+    cfg = load_detector_config()
+    cfg["ORT_INTRA_OP_THREADS"] = str(threads)
+    cfg["ORT_INTER_OP_THREADS"] = "1"
+    cfg["ORT_EXECUTION_MODE"] = "sequential"
+    cfg["ORT_CACHE_OPTIMIZED_MODEL"] = "0"  # each worker would hash the model on startup
+    return ShrimpDetector(model, conf_thresh=conf, imgsz=imgsz, session_config=cfg, precision=precision)
+
+
+def init_worker(model, conf, imgsz, threads, batch, every, precision=None):
+    # Never raise here: Pool respawns workers whose initializer fails, forever.
+    # A load failure is kept and reported by the first count_chunk instead.
+    global _worker, _worker_error
+    cv2.setNumThreads(1)  # decoding/resizing parallelism comes from the pool
+    detector = load_detector(model, conf, imgsz, threads, precision)
+    if detector.session is None:
+        _worker_error = f"Could not load model {model} in worker {os.getpid()}"
+        return
+    if detector.input_batch is not None:
+        batch = detector.input_batch  # fixed batch dimension: always fill it exactly
+    _worker = (detector, batch, every)
+
+
+def count_chunk(task):
+    """Count one chunk; returns (source, [(frame_index, count), ...])."""
+    if _worker_error:
+        raise RuntimeError(_worker_error)
+    detector, batch, every = _worker
+    source, kind, payload = task
+    rows, indices, frames = [], [], []
+    for idx, frame in read_chunk(source, kind, payload, every):
+        indices.append(idx)
+        frames.append(frame)
+        if len(frames) == batch:
+            rows.extend(zip(indices, detector.count_batch(frames)))
+            indices, frames = [], []
+    if frames:
+        rows.extend(zip(indices, detector.count_batch(frames)))
+    return source, rows
+
+
+# ---------------------------------------------------------------
+# Output sinks: CSV (default) or SQLite, chosen by file extension
+# ---------------------------------------------------------------
+class CsvSink:
+    def __init__(self, path):
+        self.file = sys.stdout if path == "-" else open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["source", "frame", "count"])
+
+    def write(self, source, rows):
+        self.writer.writerows((source, idx, count) for idx, count in rows)
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class SqliteSink:
+    def __init__(self, path, model, conf):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS frame_counts(
+            runId TEXT,
+            source TEXT,
+            frame INTEGER,
+            shrimpCount INTEGER,
+            model TEXT,
+            confThresh REAL,
+            PRIMARY KEY(runId, source, frame)
+        )
+        """)
+        self.run = (datetime.datetime.now().isoformat(timespec="seconds"), model, conf)
+
+    def write(self, source, rows):
+        run_id, model, conf = self.run
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO frame_counts VALUES(?,?,?,?,?,?)",
+                ((run_id, source, idx, count, model, conf) for idx, count in rows)
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def open_sink(path, model, conf):
+    if path.lower().endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteSink(path, model, conf)
+    return CsvSink(path)
+
+
+# ---------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------
+def run(args):
+    tasks = list(plan_chunks(args.inputs, args.chunk))
+    if not tasks:
+        raise SystemExit("No videos or images found in the given inputs.")
+    # Fail fast on a missing or broken model before any worker starts
+    if load_detector(args.model, args.conf, args.imgsz, 1, args.precision).session is None:
+        raise SystemExit(f"Could not load model {args.model}")
+    sink = open_sink(args.out, args.model, args.conf)
+    totals = {}  # source -> (frames, sum of counts)
+    start = time.perf_counter()
+
+    # spawn: workers start clean instead of inheriting the parent's threads
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(args.workers, initializer=init_worker,
+                  initargs=(args.model, args.conf, args.imgsz, args.threads, args.batch, args.every,
+                            args.precision)) as pool:
+        # Unordered so a slow chunk never holds finished results in memory
+        for done, (source, rows) in enumerate(pool.imap_unordered(count_chunk, tasks), start=1):
+            sink.write(source, rows)
+            frames, total = totals.get(source, (0, 0))
+            totals[source] = (frames + len(rows), total + sum(c for _, c in rows))
+            print(f"[{done}/{len(tasks)}] {source}: {len(rows)} frame(s)", file=sys.stderr)
+    sink.close()
+
+    elapsed = time.perf_counter() - start
+    frames = sum(f for f, _ in totals.values())
+    print(f"Counted {frames} frame(s) from {len(totals)} source(s) in {elapsed:.1f}s "
+          f"({frames / elapsed:.1f} frames/s, {args.workers} worker(s) x {args.threads} thread(s))",
+          file=sys.stderr)
+    for source, (n, total) in sorted(totals.items()):
+        print(f"  {source}: mean count {total / n if n else 0:.1f} over {n} frame(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recount shrimp in video files and image folders offline.")
+    parser.add_argument("inputs", nargs="+", help="video files, image files or folders (searched recursively)")
+    parser.add_argument("--model", default="models/YOLOshrimp.onnx")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--imgsz", type=int, default=416)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--threads", type=int, default=1, help="ONNX Runtime intra-op threads per worker")
+    parser.add_argument("--batch", type=int, default=8,
+                        help="frames per inference call when the model has a dynamic batch dimension")
+    parser.add_argument("--chunk", type=int, default=500, help="frames per work unit")
+    parser.add_argument("--every", type=int, default=1, help="count every n-th frame")
+    parser.add_argument("--precision", choices=["fp32", "int8"], help="override ORT_MODEL_PRECISION")
+    parser.add_argument("--out", default="-", help="CSV file, '-' for stdout, or .db/.sqlite for SQLite")
+    run(parser.parse_args())
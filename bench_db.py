@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+import sqlite3
+import datetime
+import tempfile
+
+import database
+
+# Usage:
+#   python bench_db.py connections [n]   per-call connect vs pooled WAL connection
+#   python bench_db.py indexes [rows]    query times before/after migrations
+
+
+# ---------------------------------------------------------------
+# Baseline: the old one-connection-per-call pattern, default journal
+# ---------------------------------------------------------------
+def old_save(path, owner_id, i):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+    INSERT INTO biomass_records(ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime, synced)
+    VALUES(?,?,?,?,?, ?,0)
+    """, (owner_id, f"rec-{i}", i, i * 0.01, i * 0.0006, "2024-01-01T00:00:00"))
+    conn.commit()
+    conn.close()
+
+
+def old_last(path, owner_id):
+    conn = sqlite3.connect(path)
+    row = conn.execute(
+        "SELECT * FROM biomass_records WHERE ownerId=? ORDER BY id DESC LIMIT 1",
+        (owner_id,)
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def run(label, save, last, n):
+    start = time.perf_counter()
+    for i in range(n):
+        save(i)
+    t_insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        last()
+    t_query = time.perf_counter() - start
+    print(f"{label:>8}: insert {n / t_insert:9.0f}/s | last-record query {n / t_query:9.0f}/s")
+
+
+def bench_connections(n):
+    tmp = tempfile.mkdtemp()
+
+    # Both runs start from a schema created by init_db in their own file
+    old_path = os.path.join(tmp, "old.db")
+    database.DB_PATH = old_path
+    database.init_db()
+    database.close_conn()
+    conn = sqlite3.connect(old_path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+    run("before", lambda i: old_save(old_path, "bench", i), lambda: old_last(old_path, "bench"), n)
+
+    database.DB_PATH = os.path.join(tmp, "new.db")
+    database.init_db()
+    run("after",
+        lambda i: database.save_biomass_record("bench", i, i * 0.01, i * 0.0006),
+        lambda: database.get_last_record("bench"), n)
+    database.close_conn()
+
+
+# ---------------------------------------------------------------
+# Indexes: same seeded table queried before and after migrate()
+# ---------------------------------------------------------------
+def seed(conn, rows, owners=5, unsynced_tail=0.02):
+    """Several busy operators, one occasional one, and a recent unsynced tail."""
+    base = datetime.datetime(2024, 1, 1)
+    first_unsynced = int(rows * (1 - unsynced_tail))
+    conn.executemany("""
+    INSERT INTO biomass_records(ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime, synced)
+    VALUES(?,?,?,?,?,?,?)
+    """, (
+        ("owner-rare" if i % 10000 == 0 else f"owner-{i % owners}",
+         f"rec-{i}", i % 500, (i % 500) * 0.01, (i % 500) * 0.0006,
+         (base + datetime.timedelta(minutes=i)).isoformat(), 0 if i >= first_unsynced else 1)
+        for i in range(rows)
+    ))
+    conn.commit()
+
+
+def time_queries(conn, repeats=20):
+    queries = {
+        "last record": ("SELECT * FROM biomass_records WHERE ownerId=? ORDER BY id DESC LIMIT 1", ("owner-rare",)),
+        "unsynced rows": ("SELECT recordId FROM biomass_records WHERE synced=0 AND ownerId=?", ("owner-3",)),
+        "first page": ("SELECT * FROM biomass_records WHERE ownerId=? ORDER BY id DESC LIMIT 50", ("owner-3",)),
+        "day range": ("SELECT COUNT(*) FROM biomass_records WHERE ownerId=? AND dateTime BETWEEN ? AND ?",
+                      ("owner-3", "2024-06-01", "2024-06-02")),
+    }
+    results = {}
+    for name, (sql, args) in queries.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            conn.execute(sql, args).fetchall()
+        results[name] = (time.perf_counter() - start) / repeats * 1000
+    return results
+
+
+def bench_indexes(rows):
+    database.DB_PATH = os.path.join(tempfile.mkdtemp(), "indexes.db")
+    conn = database.get_conn()
+    conn.execute("PRAGMA user_version = {}".format(len(database.MIGRATIONS)))  # skip migrations for now
+    database.init_db()
+    conn.execute("PRAGMA user_version = 0")
+
+    start = time.perf_counter()
+    seed(conn, rows)
+    print(f"seeded {rows} rows in {time.perf_counter() - start:.1f}s")
+
+    before = time_queries(conn)
+    start = time.perf_counter()
+    database.migrate(conn)
+    print(f"migrations took {time.perf_counter() - start:.1f}s")
+    after = time_queries(conn)
+
+    for name in before:
+        print(f"{name:>14}: {before[name]:9.3f} ms -> {after[name]:7.3f} ms")
+    database.close_conn()
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "connections"
+    if mode == "indexes":
+        bench_indexes(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
+    else:
+        bench_connections(int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,34 @@
+import sys
+import time
+import numpy as np
+
+from compute import compute_feed, get_profile
+
+# Usage: python bench_feed.py [records]
+# Recomputes feed for a synthetic history, per record in a Python loop
+# (the old way) versus one vectorized call.
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 500, size=n)
+    doc = rng.integers(0, 120, size=n)
+
+    start = time.perf_counter()
+    loop = [compute_feed(int(c)) for c in counts]
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    biomass, feed, protein, filler = compute_feed(counts)
+    t_vec = time.perf_counter() - start
+    assert np.allclose(feed, [r[1] for r in loop])
+
+    profile = get_profile("grow-out")
+    start = time.perf_counter()
+    compute_feed(counts, profile=profile, doc=doc)
+    t_profile = time.perf_counter() - start
+
+    print(f"{n} records")
+    print(f"  python loop        : {t_loop * 1000:9.1f} ms")
+    print(f"  vectorized         : {t_vec * 1000:9.1f} ms ({t_loop / t_vec:.0f}x)")
+    print(f"  vectorized + table : {t_profile * 1000:9.1f} ms (grow-out profile, per-record day of culture)")
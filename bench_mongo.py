@@ -0,0 +1,23 @@
+import sys
+import time
+import threading
+
+import database
+
+# Usage: python bench_mongo.py [calls]
+# Times repeated cloud pings through the shared client and reports the
+# process thread count, which should stay flat after the first call.
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"threads before: {threading.active_count()}")
+
+    for i in range(calls):
+        start = time.perf_counter()
+        ok, _ = database.cloud_health(timeout_ms=database.MONGO_TIMEOUT_MS)
+        ms = (time.perf_counter() - start) * 1000
+        print(f"call {i + 1:3d}: {'ok ' if ok else 'ERR'} {ms:8.1f} ms | threads {threading.active_count()}")
+
+    database.close_mongo_client()
+    time.sleep(0.5)
+    print(f"threads after close: {threading.active_count()}")
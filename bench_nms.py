@@ -0,0 +1,48 @@
+import sys
+import time
+import numpy as np
+
+from detector import NMS_BACKENDS, non_max_suppression
+
+
+# ---------------------------------------------------------------
+# Synthetic candidates: clusters of jittered boxes, like raw YOLO
+# anchors firing several times around each shrimp
+# ---------------------------------------------------------------
+def make_candidates(n, w=640, h=480, per_object=8, seed=0):
+    rng = np.random.default_rng(seed)
+    n_obj = max(1, n // per_object)
+    centers = rng.uniform((0, 0), (w, h), size=(n_obj, 2))
+    sizes = rng.uniform(15, 60, size=(n_obj, 2))
+
+    pick = rng.integers(0, n_obj, size=n)
+    xy = centers[pick] + rng.normal(0, 3, size=(n, 2))
+    wh = sizes[pick] * rng.uniform(0.9, 1.1, size=(n, 2))
+
+    boxes = np.empty((n, 4))
+    boxes[:, :2] = xy - wh / 2
+    boxes[:, 2:] = xy + wh / 2
+    scores = rng.uniform(0.25, 1.0, size=n)
+    return boxes, scores
+
+
+def time_backend(backend, boxes, scores, repeats):
+    non_max_suppression(boxes, scores, backend=backend)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        keep = non_max_suppression(boxes, scores, backend=backend)
+    elapsed = (time.perf_counter() - start) / repeats * 1000
+    return elapsed, len(keep)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print(f"{'candidates':>10} | " + " | ".join(f"{b:>18}" for b in NMS_BACKENDS))
+    for n in [100, 500, 1000, 2000, 5000, 10000]:
+        boxes, scores = make_candidates(n)
+        cells = []
+        for backend in NMS_BACKENDS:
+            ms, kept = time_backend(backend, boxes, scores, repeats)
+            cells.append(f"{ms:8.3f} ms ({kept:4d})")
+        print(f"{n:>10} | " + " | ".join(cells))
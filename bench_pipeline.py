@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import argparse
+import platform
+import subprocess
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # no screen needed for the display stage
+from PyQt5 import QtWidgets, QtGui
+
+from bench_stats import percentiles, peak_rss_mb
+from camera import ReplayCamera
+from compute import compute_feed
+from detector import ShrimpDetector
+from display import FrameConverter, VIDEO_SIZE
+
+# Headless end-to-end replay benchmark. Example:
+#   python bench_pipeline.py recordings/pond1.mp4 --frames 500 --out bench.json
+# Runs capture -> preprocess -> infer -> postprocess -> draw -> feed -> display
+# conversion per frame and reports p50/p95/p99 per stage, throughput and peak
+# RSS as JSON. Needs no camera or display.
+
+STAGES = ["capture", "preprocess", "infer", "postprocess", "draw", "feed", "display", "total"]
+_app = None
+
+
+def make_display():
+    """VideoLabel.set_frame's conversion (FrameConverter + pixmap upload), minus the widget."""
+    global _app
+    _app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # pixmaps need one
+    converter = FrameConverter()
+
+    def display(frame):
+        QtGui.QPixmap.fromImage(converter.convert(frame, *VIDEO_SIZE))
+    return display
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    detector = ShrimpDetector(args.model, conf_thresh=args.conf, imgsz=args.imgsz)
+    if detector.session is None:
+        raise SystemExit("Model failed to load; nothing to benchmark.")
+    source = ReplayCamera(args.source, loop=args.loop)
+    display = make_display()
+    times = {s: [] for s in STAGES}
+    counts = []
+    frames = 0
+
+    wall_start = None
+    while args.frames <= 0 or frames < args.frames + args.warmup:
+        t0 = time.perf_counter()
+        frame = source.get_frame()
+        if frame is None:
+            break
+        t1 = time.perf_counter()
+        h, w = frame.shape[:2]
+        tensor, scale, pad_x, pad_y = detector.preprocess(frame)
+        t2 = time.perf_counter()
+        outputs = detector.infer(tensor)
+        t3 = time.perf_counter()
+        detections = detector.postprocess(outputs, scale, pad_x, pad_y, w, h)
+        t4 = time.perf_counter()
+        vis = detector.draw(frame, detections, (t3 - t2) * 1000)
+        t5 = time.perf_counter()
+        compute_feed(len(detections))
+        t6 = time.perf_counter()
+        display(vis)
+        t7 = time.perf_counter()
+
+        frames += 1
+        if frames <= args.warmup:
+            continue
+        if wall_start is None:
+            wall_start = t0
+        for stage, (a, b) in zip(STAGES, [(t0, t1), (t1, t2), (t2, t3), (t3, t4),
+                                          (t4, t5), (t5, t6), (t6, t7), (t0, t7)]):
+            times[stage].append((b - a) * 1000)
+        counts.append(len(detections))
+    source.release()
+
+    measured = len(times["total"])
+    wall = time.perf_counter() - wall_start if wall_start else 0.0
+    return {
+        "commit": git_commit(),
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "source": os.path.abspath(args.source),
+        "model": detector.model_path,
+        "providers": detector.session.get_providers(),
+        "imgsz": args.imgsz,
+        "frames": measured,
+        "warmup": args.warmup,
+        "throughput_fps": round(measured / wall, 2) if wall else None,
+        "mean_count": round(float(np.mean(counts)), 2) if counts else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages_ms": {s: percentiles(times[s]) for s in STAGES},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay frames through the detection pipeline and time each stage.")
+    parser.add_argument("source", help="video file or folder of images")
+    parser.add_argument("--model", default="models/YOLOshrimp.onnx")
+    parser.add_argument("--imgsz", type=int, default=416)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--frames", type=int, default=0, help="frames to measure (0 = whole source)")
+    parser.add_argument("--warmup", type=int, default=10, help="frames run before measuring")
+    parser.add_argument("--loop", action="store_true", help="rewind the source until --frames is reached")
+    parser.add_argument("--out", help="write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report + "\n")
@@ -0,0 +1,163 @@
+import os
+import csv
+import json
+import time
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import cv2
+
+from bench_stats import percentiles, peak_rss_mb
+from camera import ReplayCamera
+from detector import ShrimpDetector, load_detector_config
+
+# FP32 vs INT8 comparison on a held-out folder of pond frames. Example:
+#   python bench_quant.py holdout_frames/ --labels holdout_counts.csv --out quant_report.json
+# Each model runs in its own fresh process, so peak RSS is per model. Count
+# accuracy is measured against the FP32 counts and, with --labels (CSV of
+# file,count), against hand counts too.
+
+
+def measure(model, int8_model, precision, files, imgsz, conf, repeats, warmup):
+    """Runs in a child process: load one model, count every file, time inference."""
+    base_rss = peak_rss_mb()
+    cfg = load_detector_config()
+    cfg["ORT_CACHE_OPTIMIZED_MODEL"] = "0"  # compare the model files themselves
+    cfg["ORT_INT8_MODEL_PATH"] = int8_model
+
+    start = time.perf_counter()
+    detector = ShrimpDetector(model, conf_thresh=conf, imgsz=imgsz, session_config=cfg, precision=precision)
+    load_ms = (time.perf_counter() - start) * 1000
+    expected = int8_model if precision == "int8" else model
+    if detector.session is None or detector.loaded_path != expected:
+        raise RuntimeError(f"{precision} model {expected} did not load")
+
+    counts, infer_ms, frame_ms = {}, [], []
+    for rep in range(repeats):
+        for i, f in enumerate(files):
+            frame = cv2.imread(f)
+            if frame is None:
+                continue
+            h, w = frame.shape[:2]
+            t0 = time.perf_counter()
+            tensor, scale, pad_x, pad_y = detector.preprocess(frame)
+            t1 = time.perf_counter()
+            outputs = detector.infer(tensor)
+            t2 = time.perf_counter()
+            count = len(detector.postprocess(outputs, scale, pad_x, pad_y, w, h))
+            t3 = time.perf_counter()
+            if rep == 0:
+                counts[os.path.basename(f)] = count
+            if rep or i >= warmup:
+                infer_ms.append((t2 - t1) * 1000)
+                frame_ms.append((t3 - t0) * 1000)
+    if not frame_ms:
+        raise RuntimeError(f"No readable frames left to time after --warmup {warmup}")
+
+    return {
+        "model": expected,
+        "file_mb": round(os.path.getsize(expected) / 1e6, 2),
+        "providers": detector.session.get_providers(),
+        "load_ms": round(load_ms, 1),
+        "infer_ms": percentiles(infer_ms),
+        "frame_ms": percentiles(frame_ms),
+        "fps": round(1000 / float(np.mean(frame_ms)), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_over_baseline_mb": round(peak_rss_mb() - base_rss, 1),
+        "counts": counts,
+    }
+
+
+def count_errors(pred, ref):
+    """Error of `pred` counts against `ref` counts over the files both have."""
+    keys = sorted(set(pred) & set(ref))
+    if not keys:
+        return {"frames": 0, "error": "no matching reference counts (file names do not match the held-out images)"}
+    p = np.array([pred[k] for k in keys], dtype=np.float64)
+    r = np.array([ref[k] for k in keys], dtype=np.float64)
+    diff = p - r
+    return {
+        "frames": len(keys),
+        "mae": round(float(np.abs(diff).mean()), 3),
+        "max_abs_error": int(np.abs(diff).max()),
+        "exact_pct": round(float((diff == 0).mean() * 100), 1),
+        "within_1_pct": round(float((np.abs(diff) <= 1).mean() * 100), 1),
+        "bias_pct": round(float(diff.sum() / max(r.sum(), 1) * 100), 2),  # total count drift
+    }
+
+
+def load_labels(path):
+    with open(path, newline="") as f:
+        return {os.path.basename(row[0]): int(row[1]) for row in csv.reader(f) if row and row[1].strip().isdigit()}
+
+
+def run(args):
+    files = ReplayCamera(args.holdout).images
+    if not files:
+        raise SystemExit(f"No images in {args.holdout}")
+    if args.repeats < 2 and args.warmup >= len(files):
+        raise SystemExit(f"--warmup {args.warmup} leaves no timed frames out of {len(files)}; "
+                         f"lower it or raise --repeats")
+    if not os.path.exists(args.int8):
+        raise SystemExit(f"{args.int8} not found; build it with quantize_model.py first")
+
+    results = {}
+    for precision in ("fp32", "int8"):
+        # Fresh process per model so memory numbers do not mix
+        with ProcessPoolExecutor(1, mp_context=mp.get_context("spawn")) as pool:
+            results[precision] = pool.submit(
+                measure, args.model, args.int8, precision, files,
+                args.imgsz, args.conf, args.repeats, args.warmup
+            ).result()
+
+    fp32, int8 = results["fp32"], results["int8"]
+    accuracy = {"int8_vs_fp32": count_errors(int8["counts"], fp32["counts"])}
+    if args.labels:
+        labels = load_labels(args.labels)
+        accuracy["fp32_vs_labels"] = count_errors(fp32["counts"], labels)
+        accuracy["int8_vs_labels"] = count_errors(int8["counts"], labels)
+
+    vs = accuracy["int8_vs_fp32"]
+    speedup = fp32["frame_ms"]["mean"] / int8["frame_ms"]["mean"]
+    safe = (vs["frames"] > 0 and speedup > 1.0 and
+            vs["mae"] <= args.max_mae and abs(vs["bias_pct"]) <= args.max_bias_pct)
+
+    report = {
+        "holdout": os.path.abspath(args.holdout),
+        "frames": len(files),
+        "imgsz": args.imgsz,
+        "conf": args.conf,
+        "models": {p: {k: v for k, v in r.items() if k != "counts"} for p, r in results.items()},
+        "speedup": round(speedup, 2),
+        "accuracy": accuracy,
+        "thresholds": {"max_mae": args.max_mae, "max_bias_pct": args.max_bias_pct},
+        "int8_recommended": safe,
+    }
+    if args.per_frame:
+        report["per_frame"] = {k: [fp32["counts"][k], int8["counts"].get(k)] for k in fp32["counts"]}
+    return report
+
+
+if __name__ == "__main__":
+    cfg = load_detector_config()
+    parser = argparse.ArgumentParser(description="Compare FP32 and INT8 YOLOshrimp on held-out frames.")
+    parser.add_argument("holdout", help="folder of held-out pond frames (not used for calibration)")
+    parser.add_argument("--model", default="models/YOLOshrimp.onnx", help="FP32 model")
+    parser.add_argument("--int8", default=cfg["ORT_INT8_MODEL_PATH"], help="INT8 model")
+    parser.add_argument("--labels", help="optional CSV of file,count hand counts")
+    parser.add_argument("--imgsz", type=int, default=416)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--repeats", type=int, default=1, help="passes over the set for latency")
+    parser.add_argument("--warmup", type=int, default=5, help="frames excluded from latency")
+    parser.add_argument("--max-mae", type=float, default=0.5, help="allowed mean abs count error vs FP32")
+    parser.add_argument("--max-bias-pct", type=float, default=2.0, help="allowed total count drift vs FP32")
+    parser.add_argument("--per-frame", action="store_true", help="include per-frame counts in the report")
+    parser.add_argument("--out", help="write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report + "\n")
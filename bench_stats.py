@@ -0,0 +1,23 @@
+import sys
+import resource
+import numpy as np
+
+# Helpers shared by the benchmark scripts (bench_pipeline.py, bench_quant.py).
+
+
+def percentiles(ms):
+    """p50/p95/p99/mean of a list of timings in ms, or None if it is empty."""
+    if not ms:
+        return None
+    a = np.asarray(ms)
+    return {
+        "p50": round(float(np.percentile(a, 50)), 3),
+        "p95": round(float(np.percentile(a, 95)), 3),
+        "p99": round(float(np.percentile(a, 99)), 3),
+        "mean": round(float(a.mean()), 3),
+    }
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KB on Linux
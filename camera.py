@@ -1,14 +1,139 @@
+import os
+import threading
+import time
+from collections import deque
 import cv2
 
+import metrics
+
 class Camera:
-    def __init__(self, index=0):
+    def __init__(self, index=0, threaded=False, buffer_size=2):
         self.cap = cv2.VideoCapture(index)
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
 
+        # --- Threaded capture: grabber keeps only the newest frames ---
+        self.threaded = threaded
+        self.frames = deque(maxlen=buffer_size)  # (frame, timestamp, seq)
+        self.lock = threading.Lock()
+        self.seq = 0              # frames grabbed so far
+        self.last_seq = 0         # seq of the last frame handed out
+        self.dropped = 0          # frames grabbed but never handed out
+        self.running = False
+        self.thread = None
+
+        if threaded:
+            # Keep the driver queue short so frames are not stale on arrival
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.running = True
+            self.thread = threading.Thread(target=self._grab_loop, daemon=True)
+            self.thread.start()
+
+    def _grab_loop(self):
+        # The grabber owns the capture: it releases it on the way out, so a
+        # read() stuck on a stalled camera never races cap.release()
+        try:
+            while self.running:
+                ok, frame = self.cap.read()
+                if not ok:
+                    time.sleep(0.01)
+                    continue
+                with self.lock:
+                    self.seq += 1
+                    self.frames.append((frame, time.monotonic(), self.seq))
+        finally:
+            self.cap.release()
+
+    def read_latest(self):
+        """Return (frame, capture_timestamp, seq) of the newest frame, or (None, None, None)."""
+        if not self.threaded:
+            ok, frame = self.cap.read()
+            if not ok:
+                return None, None, None
+            self.seq += 1
+            self.last_seq = self.seq
+            return frame, time.monotonic(), self.seq
+
+        with self.lock:
+            if not self.frames:
+                return None, None, None
+            frame, ts, seq = self.frames[-1]
+            self.frames.clear()
+            self.dropped += seq - self.last_seq - 1
+            metrics.incr("camera.dropped", seq - self.last_seq - 1)
+            self.last_seq = seq
+        return frame, ts, seq
+
     def get_frame(self):
+        with metrics.timer("camera.get_frame_ms"):
+            frame, _, _ = self.read_latest()
+        metrics.incr("camera.frames" if frame is not None else "camera.empty")
+        return frame
+
+    def stats(self):
+        """Capture counters for checking display latency in production."""
+        with self.lock:
+            return {"captured": self.seq, "last_delivered_seq": self.last_seq, "dropped": self.dropped}
+
+    def release(self):
+        self.running = False
+        if self.thread is None:
+            self.cap.release()
+            return
+        self.thread.join(timeout=1.0)
+        if self.thread.is_alive():
+            print("Camera read still blocked; it is released when the read returns")
+        self.thread = None
+
+
+class ReplayCamera:
+    """
+    Camera-compatible source that replays a video file or an image folder,
+    for benchmarks and offline runs with no camera attached.
+    """
+    IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+    def __init__(self, path, loop=False):
+        self.path = path
+        self.loop = loop
+        self.seq = 0   # frames delivered
+        self.pos = 0   # next image in the folder
+        if os.path.isdir(path):
+            self.images = sorted(
+                os.path.join(path, f) for f in os.listdir(path)
+                if f.lower().endswith(self.IMAGE_EXTS)
+            )
+            self.cap = None
+        else:
+            self.images = None
+            self.cap = cv2.VideoCapture(path)
+
+    def _read(self):
+        if self.images is not None:
+            if self.pos >= len(self.images):
+                if not self.loop or not self.images:
+                    return None
+                self.pos = 0
+            self.pos += 1
+            return cv2.imread(self.images[self.pos - 1])
+
         ok, frame = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
         return frame if ok else None
 
+    def read_latest(self):
+        frame = self._read()
+        if frame is None:
+            return None, None, None
+        self.seq += 1
+        return frame, time.monotonic(), self.seq
+
+    def get_frame(self):
+        frame, _, _ = self.read_latest()
+        return frame
+
     def release(self):
-        self.cap.release()
+        if self.cap is not None:
+            self.cap.release()
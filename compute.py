@@ -1,10 +1,91 @@
+import os
+import json
+import numpy as np
+
 AVG_WEIGHT = 0.01
 FEED_RATE = 0.06
 PROTEIN_RATIO = 0.35
 
-def compute_feed(count):
-    biomass = count * AVG_WEIGHT
-    feed = biomass * FEED_RATE
-    protein = feed * PROTEIN_RATIO
-    filler = feed - protein
-    return biomass, feed, protein, filler
+FEED_PROFILES_PATH = "config/feed_profiles.json"
+
+
+def compute_feed(count, profile=None, avg_weight=None, doc=None):
+    """
+    Biomass, feed, protein and filler for a count. `count` may be a scalar or
+    a NumPy array (e.g. a whole history or a sliding window). Without a
+    profile the module constants apply, exactly as before; with a profile,
+    feed rate comes from its weight-band table and average weight from
+    `avg_weight` or the profile's day-of-culture (`doc`) growth curve.
+    """
+    if profile is None and avg_weight is None and doc is None:
+        biomass = count * AVG_WEIGHT
+        feed = biomass * FEED_RATE
+        protein = feed * PROTEIN_RATIO
+        filler = feed - protein
+        return biomass, feed, protein, filler
+    return (profile or get_profile()).compute(count, avg_weight=avg_weight, doc=doc)
+
+
+class FeedProfile:
+    """
+    A feeding model held as lookup arrays:
+      weight_bands  upper bound (g) of each average-weight band, ascending
+      feed_rates    feed as a fraction of biomass for each band
+      doc_weights   optional expected average weight (g) per day of culture
+    """
+    def __init__(self, name, weight_bands, feed_rates, protein_ratio=PROTEIN_RATIO,
+                 avg_weight=AVG_WEIGHT, doc_weights=None):
+        self.name = name
+        self.weight_bands = np.asarray(weight_bands, dtype=np.float64)
+        self.feed_rates = np.asarray(feed_rates, dtype=np.float64)
+        if len(self.weight_bands) != len(self.feed_rates):
+            raise ValueError(f"Feed profile '{name}': weight_bands and feed_rates differ in length")
+        self.protein_ratio = protein_ratio
+        self.avg_weight = avg_weight
+        self.doc_weights = None if doc_weights is None else np.asarray(doc_weights, dtype=np.float64)
+
+    def weight_for(self, doc):
+        """Expected average weight for day(s) of culture; past the table, the last value holds."""
+        if self.doc_weights is None:
+            return np.full(np.shape(doc), self.avg_weight)
+        idx = np.clip(np.asarray(doc, dtype=np.int64), 0, len(self.doc_weights) - 1)
+        return self.doc_weights[idx]
+
+    def rate_for(self, avg_weight):
+        """Feed rate for average weight(s); heavier than the last band uses the last rate."""
+        idx = np.searchsorted(self.weight_bands, avg_weight, side="left")
+        return self.feed_rates[np.minimum(idx, len(self.feed_rates) - 1)]
+
+    def compute(self, count, avg_weight=None, doc=None):
+        if avg_weight is None:
+            avg_weight = self.weight_for(doc) if doc is not None else self.avg_weight
+        biomass = np.multiply(count, avg_weight, dtype=np.float64)
+        feed = biomass * self.rate_for(avg_weight)
+        protein = feed * self.protein_ratio
+        filler = feed - protein
+        return biomass, feed, protein, filler
+
+
+# ---------------------------------------------------------------
+# Profiles: loaded once from config/feed_profiles.json
+# ---------------------------------------------------------------
+DEFAULT_PROFILE = FeedProfile("default", [np.inf], [FEED_RATE])
+
+_profiles = None
+
+
+def load_profiles(path=FEED_PROFILES_PATH):
+    """Read all feed profiles from JSON (a name -> settings mapping) and cache them."""
+    global _profiles
+    _profiles = {"default": DEFAULT_PROFILE}
+    if os.path.exists(path):
+        with open(path) as f:
+            for name, cfg in json.load(f).items():
+                _profiles[name] = FeedProfile(name, **cfg)
+    return _profiles
+
+
+def get_profile(name="default"):
+    if _profiles is None:
+        load_profiles()
+    return _profiles.get(name, DEFAULT_PROFILE)
@@ -1,27 +1,265 @@
-import sqlite3, os, datetime, bcrypt, uuid
+import sqlite3, os, datetime, bcrypt, uuid, threading, time
+import pymongo
 from pymongo import MongoClient
 
+import metrics
+from settings import load_env_config
+
 
 # ------------------------
 # Configuration
 # ------------------------
 DB_PATH = "local.db"
-MONGO_URI = None
-MONGO_DB_NAME = "test"  # your MongoDB database name
+CLOUD_CONFIG_PATH = "config/config.env"
+
+DEFAULT_CLOUD_CONFIG = {
+    "MONGO_URI": "",
+    "MONGO_DB_NAME": "test",              # your MongoDB database name
+    "MONGO_MAX_POOL_SIZE": "4",           # sockets per server in the shared client
+    "MONGO_TIMEOUT_MS": "4000",           # server selection / connect timeout
+    "MONGO_MAX_IDLE_MS": "60000",         # drop pooled sockets idle longer than this
+    "MONGO_SOCKET_TIMEOUT_MS": "30000",   # give up on a socket read/write that stalls this long
+    "MONGO_SYNC_TIMEOUT_MS": "20000",     # time limit for one sync batch (bulk_write)
+}
+
+# --- Load MongoDB settings from config.env (environment variables win) ---
+_cloud_cfg = load_env_config(CLOUD_CONFIG_PATH, DEFAULT_CLOUD_CONFIG)
+MONGO_URI = _cloud_cfg["MONGO_URI"] or None
+MONGO_DB_NAME = _cloud_cfg["MONGO_DB_NAME"]
+MONGO_MAX_POOL_SIZE = int(_cloud_cfg["MONGO_MAX_POOL_SIZE"])
+MONGO_TIMEOUT_MS = int(_cloud_cfg["MONGO_TIMEOUT_MS"])
+MONGO_MAX_IDLE_MS = int(_cloud_cfg["MONGO_MAX_IDLE_MS"])
+MONGO_SOCKET_TIMEOUT_MS = int(_cloud_cfg["MONGO_SOCKET_TIMEOUT_MS"])
+MONGO_SYNC_TIMEOUT_MS = int(_cloud_cfg["MONGO_SYNC_TIMEOUT_MS"])
+
+
+# ------------------------
+# Connection Manager
+# ------------------------
+_local = threading.local()
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",      # readers never block the writer
+    "PRAGMA synchronous=NORMAL",    # fsync on checkpoint, not every commit (safe with WAL)
+    "PRAGMA cache_size=-8000",      # ~8 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def get_conn():
+    """Return this thread's persistent SQLite connection, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != DB_PATH:
+        # Statements are prepared once per connection and reused from its cache
+        conn = sqlite3.connect(DB_PATH, cached_statements=128)
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+def close_conn():
+    """Close this thread's connection (call when a worker thread or the app exits)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.execute("PRAGMA optimize")
+        conn.close()
+        _local.conn = None
+
+
+# ------------------------
+# Cloud Client Manager
+# ------------------------
+_mongo_client = None
+_mongo_lock = threading.Lock()
+
+
+def get_mongo_client():
+    """
+    Shared MongoClient, created on first use. One client means one DNS/TLS
+    handshake, one set of monitor threads and a bounded socket pool for the
+    whole process; pymongo clients are thread-safe.
+    """
+    global _mongo_client
+    with _mongo_lock:
+        if _mongo_client is None:
+            _mongo_client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=0,
+                maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+                serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                connectTimeoutMS=MONGO_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            )
+        return _mongo_client
+
+
+def get_cloud_db():
+    return get_mongo_client()[MONGO_DB_NAME]
+
+
+@metrics.timed("db.cloud_health_ms")
+def cloud_health(timeout_ms=2000):
+    """Ping the cluster with a per-call time limit; returns (ok, latency_ms)."""
+    if not MONGO_URI:
+        return False, None
+    start = time.perf_counter()
+    try:
+        with pymongo.timeout(timeout_ms / 1000):
+            get_mongo_client().admin.command("ping")
+        return True, (time.perf_counter() - start) * 1000
+    except Exception:
+        return False, None
+
+
+def close_mongo_client():
+    """Close the shared client (sockets and monitor threads); call on app exit."""
+    global _mongo_client
+    with _mongo_lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+            _mongo_client = None
+
+
+# ------------------------
+# Change Events
+# ------------------------
+# Listeners are called as fn(kind, owner_id, ids) after a commit, where kind is
+# "inserted", "deleted" or "synced" and ids are local biomass_records ids.
+# They may run on any thread (e.g. the background sync), so UI code should
+# forward them through a queued Qt signal.
+_change_listeners = []
+
+
+def add_change_listener(fn):
+    _change_listeners.append(fn)
+
+
+def remove_change_listener(fn):
+    if fn in _change_listeners:
+        _change_listeners.remove(fn)
+
 
-# --- Load MongoDB URI from config.env ---
-if os.path.exists("config/config.env"):
-    for line in open("config/config.env"):
-        if line.startswith("MONGO_URI"):
-            MONGO_URI = line.split("=", 1)[1].strip()
+def _notify(kind, owner_id, ids):
+    for fn in list(_change_listeners):
+        try:
+            fn(kind, owner_id, list(ids))
+        except Exception as e:
+            print("Change listener error:", e)
+
+
+# ------------------------
+# Schema Migrations
+# ------------------------
+# Each entry upgrades the schema by one version; PRAGMA user_version records
+# how many have been applied. Only ever append to this list.
+MIGRATIONS = [
+    # 1: per-user history and last-record lookups, newest first
+    (
+        "CREATE INDEX IF NOT EXISTS idx_records_owner_id ON biomass_records(ownerId, id DESC)",
+    ),
+    # 2: pending-sync rows only (stays small once records are synced)
+    (
+        "CREATE INDEX IF NOT EXISTS idx_records_unsynced ON biomass_records(ownerId, id) WHERE synced=0",
+    ),
+    # 3: date-range queries
+    (
+        "CREATE INDEX IF NOT EXISTS idx_records_datetime ON biomass_records(ownerId, dateTime)",
+    ),
+    # 4: sync checkpoint (every record with id <= lastSyncedId is in the cloud)
+    (
+        """CREATE TABLE IF NOT EXISTS sync_state(
+            ownerId TEXT PRIMARY KEY,
+            lastSyncedId INTEGER NOT NULL DEFAULT 0
+        )""",
+    ),
+    # 5: deletion tombstones, pushed to the cloud later in batches
+    (
+        """CREATE TABLE IF NOT EXISTS deleted_records(
+            recordId TEXT PRIMARY KEY,
+            ownerId TEXT,
+            deletedAt TEXT,
+            synced INTEGER DEFAULT 0,
+            attempts INTEGER DEFAULT 0
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_deleted_unsynced ON deleted_records(recordId) WHERE synced=0",
+    ),
+    # 6: per-user daily rollup for analytics, kept current by triggers
+    (
+        """CREATE TABLE IF NOT EXISTS biomass_daily(
+            ownerId TEXT,
+            day TEXT,
+            records INTEGER NOT NULL DEFAULT 0,
+            totalCount INTEGER NOT NULL DEFAULT 0,
+            totalBiomass REAL NOT NULL DEFAULT 0,
+            totalFeed REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY(ownerId, day)
+        ) WITHOUT ROWID""",
+        """INSERT OR REPLACE INTO biomass_daily(ownerId, day, records, totalCount, totalBiomass, totalFeed)
+        SELECT ownerId, substr(dateTime, 1, 10), COUNT(*),
+               COALESCE(SUM(shrimpCount), 0), COALESCE(SUM(biomass), 0), COALESCE(SUM(feedMeasurement), 0)
+        FROM biomass_records GROUP BY ownerId, substr(dateTime, 1, 10)""",
+        """CREATE TRIGGER IF NOT EXISTS trg_daily_insert AFTER INSERT ON biomass_records BEGIN
+            INSERT INTO biomass_daily(ownerId, day, records, totalCount, totalBiomass, totalFeed)
+            VALUES(NEW.ownerId, substr(NEW.dateTime, 1, 10), 1,
+                   COALESCE(NEW.shrimpCount, 0), COALESCE(NEW.biomass, 0), COALESCE(NEW.feedMeasurement, 0))
+            ON CONFLICT(ownerId, day) DO UPDATE SET
+                records = records + 1,
+                totalCount = totalCount + excluded.totalCount,
+                totalBiomass = totalBiomass + excluded.totalBiomass,
+                totalFeed = totalFeed + excluded.totalFeed;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_daily_delete AFTER DELETE ON biomass_records BEGIN
+            UPDATE biomass_daily SET
+                records = records - 1,
+                totalCount = totalCount - COALESCE(OLD.shrimpCount, 0),
+                totalBiomass = totalBiomass - COALESCE(OLD.biomass, 0),
+                totalFeed = totalFeed - COALESCE(OLD.feedMeasurement, 0)
+            WHERE ownerId = OLD.ownerId AND day = substr(OLD.dateTime, 1, 10);
+            DELETE FROM biomass_daily
+            WHERE ownerId = OLD.ownerId AND day = substr(OLD.dateTime, 1, 10) AND records <= 0;
+        END""",
+    ),
+]
+
+
+@metrics.timed("db.migrate_ms")
+def migrate(conn):
+    """Apply pending migrations, each in its own transaction. Returns the schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    applied = False
+    for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        conn.execute("BEGIN")
+        try:
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Applied database migration {target}.")
+        version = target
+        applied = True
+
+    if applied:
+        # Give the planner statistics so it can choose between the new indexes
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+        conn.commit()
+    return version
 
 
 # ------------------------
 # Database Initialization
 # ------------------------
+LOCAL_ADMIN_ID = "local-admin"  # offline admin; exists only locally, never revalidated away
+
 def init_db():
     """Initialize local SQLite database tables."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     conn.execute("""
     CREATE TABLE IF NOT EXISTS users(
         id TEXT PRIMARY KEY,
@@ -43,6 +281,7 @@ def init_db():
     )
     """)
     conn.commit()
+    migrate(conn)
 
     # Create default offline admin if no user exists
     cur = conn.execute("SELECT COUNT(*) FROM users")
@@ -50,89 +289,172 @@ def init_db():
         hashed_pw = bcrypt.hashpw("admin".encode(), bcrypt.gensalt()).decode()
         conn.execute(
             "INSERT INTO users(id, username, email, password) VALUES(?,?,?,?)",
-            ("local-admin", "admin", "admin@example.com", hashed_pw)
+            (LOCAL_ADMIN_ID, "admin", "admin@example.com", hashed_pw)
         )
         conn.commit()
-    conn.close()
 
 
 # ------------------------
 # User Authentication
 # ------------------------
-def verify_user(username, password):
-    print(f"Attempting MongoDB verification for user: {username}")
-    print(f"Using MONGO_URI: {MONGO_URI}")
-    print(f"Using MONGO_DB_NAME: {MONGO_DB_NAME}")
+@metrics.timed("db.verify_local_user_ms")
+def verify_local_user(username, password):
+    """Check credentials against the cached users table only (no network)."""
+    row = get_conn().execute("SELECT id, password FROM users WHERE username=?", (username,)).fetchone()
+    if row and bcrypt.checkpw(password.encode(), row[1].encode()):
+        print("Local user verified successfully.")
+        return row[0]
+    return None
+
 
+@metrics.timed("db.verify_cloud_user_ms")
+def verify_cloud_user(username, password):
+    """Check credentials against MongoDB and refresh the cached copy on success."""
+    print(f"Attempting MongoDB verification for user: {username}")
     try:
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=3000)
-        db = client[MONGO_DB_NAME]
-        user = db["users"].find_one({"username": username})
+        with pymongo.timeout(3):
+            user = get_cloud_db()["users"].find_one({"username": username})
         print(f"MongoDB user found: {bool(user)}")
-        if user:
-            print(f"Stored password hash (MongoDB): {user['password']}")
-            if bcrypt.checkpw(password.encode(), user["password"].encode()):
-                print("bcrypt.checkpw successful for MongoDB user.")
-                # ✅ FIXED: Convert ObjectId to string before caching
-                cache_user(str(user["_id"]), user["username"], user["email"], user["password"])
-                return str(user["_id"])
+        if user and bcrypt.checkpw(password.encode(), user["password"].encode()):
+            print("bcrypt.checkpw successful for MongoDB user.")
+            # ✅ FIXED: Convert ObjectId to string before caching
+            cache_user(str(user["_id"]), user["username"], user["email"], user["password"])
+            return str(user["_id"])
     except Exception as e:
         print("MongoDB connection failed:", e)
+    return None
 
-    # Fallback: Local login
-    print("Falling back to local SQLite verification...")
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.execute("SELECT id, password FROM users WHERE username=?", (username,))
-    row = cur.fetchone()
-    conn.close()
-    if row and bcrypt.checkpw(password.encode(), row[1].encode()):
-        print("Local user verified successfully.")
-        return row[0]
+
+def _revalidate(username):
+    """
+    Bring a cached login in line with MongoDB Atlas after a local-first login:
+    a password changed in the cloud replaces the cached hash, and a user that
+    no longer exists in the cloud loses its cached credentials. Does nothing
+    while the cloud is unreachable.
+    """
+    try:
+        with pymongo.timeout(3):
+            user = get_cloud_db()["users"].find_one({"username": username})
+        conn = get_conn()
+        if user is None:
+            with conn:
+                cur = conn.execute("DELETE FROM users WHERE username=? AND id<>?", (username, LOCAL_ADMIN_ID))
+            if cur.rowcount:
+                print(f"User {username} no longer exists in MongoDB; removed cached credentials.")
+            return
+
+        uid = str(user["_id"])
+        cached = conn.execute("SELECT id, email, password FROM users WHERE username=?", (username,)).fetchone()
+        if cached != (uid, user.get("email"), user["password"]):
+            if cached and cached[0] != uid:
+                with conn:  # account re-created in the cloud under a new id
+                    conn.execute("DELETE FROM users WHERE id=?", (cached[0],))
+            cache_user(uid, user["username"], user.get("email"), user["password"])
+            print(f"Refreshed cached credentials for {username} from MongoDB.")
+    except Exception as e:
+        print("Background revalidation skipped:", e)
+    finally:
+        close_conn()
+
+
+@metrics.timed("db.verify_user_ms")
+def verify_user(username, password):
+    """
+    Local-first login: accept cached credentials immediately and revalidate
+    against the cloud in a background thread (refreshing the cached hash).
+    Only users not cached yet wait for MongoDB. Call this off the GUI thread;
+    bcrypt is deliberately slow.
+    """
+    uid = verify_local_user(username, password)
+    if uid:
+        threading.Thread(target=_revalidate, args=(username,), daemon=True).start()
+        return uid
+
+    print("No cached match, trying MongoDB...")
+    uid = verify_cloud_user(username, password)
+    if uid:
+        return uid
 
     print("Invalid credentials for all sources.")
     return None
 
+@metrics.timed("db.cache_user_ms")
 def cache_user(uid, username, email, hashed_pw):
-    """Cache verified MongoDB user locally for offline access."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-    INSERT OR IGNORE INTO users(id, username, email, password)
-    VALUES(?,?,?,?)
-    """, (uid, username, email, hashed_pw))
-    conn.commit()
-    conn.close()
+    """Cache verified MongoDB user locally for offline access (refreshes a changed hash)."""
+    conn = get_conn()
+    try:
+        conn.execute("""
+        INSERT INTO users(id, username, email, password)
+        VALUES(?,?,?,?)
+        ON CONFLICT(id) DO UPDATE SET
+            username=excluded.username, email=excluded.email, password=excluded.password
+        """, (uid, username, email, hashed_pw))
+        conn.commit()
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        print("Could not cache user:", e)
 
 
 # ------------------------
 # Biomass Record Handling
 # ------------------------
+@metrics.timed("db.save_biomass_record_ms")
 def save_biomass_record(owner_id, shrimp_count, biomass, feed_measurement):
     """Save a local record for the current user."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     record_id = str(uuid.uuid4())
     date_time = datetime.datetime.now().isoformat()
-    conn.execute("""
+    cur = conn.execute("""
     INSERT INTO biomass_records(ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime, synced)
     VALUES(?,?,?,?,?, ?,0)
     """, (owner_id, record_id, shrimp_count, biomass, feed_measurement, date_time))
     conn.commit()
-    conn.close()
+    _notify("inserted", owner_id, [cur.lastrowid])
+    return cur.lastrowid
 
 
+@metrics.timed("db.get_all_records_ms")
 def get_all_records(owner_id):
     """Retrieve all local records belonging to a specific user."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     rows = conn.execute(
         "SELECT * FROM biomass_records WHERE ownerId=? ORDER BY id DESC",
         (owner_id,)
     ).fetchall()
-    conn.close()
     return rows
 
 
+@metrics.timed("db.get_records_by_ids_ms")
+def get_records_by_ids(owner_id, ids):
+    """Specific records of a user, newest first."""
+    if not ids:
+        return []
+    marks = ",".join("?" * len(ids))
+    return get_conn().execute(
+        f"SELECT * FROM biomass_records WHERE ownerId=? AND id IN ({marks}) ORDER BY id DESC",
+        (owner_id, *ids)
+    ).fetchall()
+
+
+@metrics.timed("db.get_records_page_ms")
+def get_records_page(owner_id, before_id=None, limit=50):
+    """One page of a user's records, newest first (keyset pagination on id)."""
+    conn = get_conn()
+    if before_id is None:
+        return conn.execute(
+            "SELECT * FROM biomass_records WHERE ownerId=? ORDER BY id DESC LIMIT ?",
+            (owner_id, limit)
+        ).fetchall()
+    return conn.execute(
+        "SELECT * FROM biomass_records WHERE ownerId=? AND id<? ORDER BY id DESC LIMIT ?",
+        (owner_id, before_id, limit)
+    ).fetchall()
+
+
+@metrics.timed("db.get_last_record_ms")
 def get_last_record(owner_id=None):
     """Retrieve the most recent record (optionally filtered by user)."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     if owner_id:
         row = conn.execute(
             "SELECT * FROM biomass_records WHERE ownerId=? ORDER BY id DESC LIMIT 1",
@@ -140,116 +462,226 @@ def get_last_record(owner_id=None):
         ).fetchone()
     else:
         row = conn.execute("SELECT * FROM biomass_records ORDER BY id DESC LIMIT 1").fetchone()
-    conn.close()
     return row
 
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
 
-def delete_record(record_id, owner_id):
+@metrics.timed("db.delete_records_ms")
+def delete_records(record_ids, owner_id):
     """
-    Delete a specific record both locally and in MongoDB Atlas (if synced).
+    Delete records locally and leave a tombstone for each one. The tombstones
+    are the authoritative list of deletions; sync_deletions() pushes them to
+    MongoDB Atlas later, so this never touches the network. Returns the
+    number of records deleted.
     """
-    print(f"Deleting record {record_id} for user {owner_id}...")
+    ids = [(rid, owner_id) for rid in record_ids]
+    now = datetime.datetime.now().isoformat()
+    conn = get_conn()
+    with conn:
+        conn.executemany("""
+        INSERT OR REPLACE INTO deleted_records(recordId, ownerId, deletedAt, synced, attempts)
+        SELECT recordId, ownerId, ?, 0, 0 FROM biomass_records WHERE id=? AND ownerId=?
+        """, [(now,) + i for i in ids])
+        cur = conn.executemany("DELETE FROM biomass_records WHERE id=? AND ownerId=?", ids)
+    print(f"Deleted {cur.rowcount} record(s) locally for user {owner_id}; cloud deletion queued.")
+    _notify("deleted", owner_id, record_ids)
+    return cur.rowcount
 
-    # --- 1. Delete locally ---
-    conn = sqlite3.connect(DB_PATH)
-    record = conn.execute(
-        "SELECT recordId, synced FROM biomass_records WHERE id=? AND ownerId=?",
-        (record_id, owner_id)
-    ).fetchone()
 
-    if not record:
-        print("No record found locally.")
-        conn.close()
-        return
+def delete_record(record_id, owner_id):
+    """Delete a specific record locally and queue its deletion in MongoDB Atlas."""
+    return delete_records([record_id], owner_id)
 
-    record_uuid, synced = record
 
-    conn.execute("DELETE FROM biomass_records WHERE id=? AND ownerId=?", (record_id, owner_id))
-    conn.commit()
-    conn.close()
-    print("Deleted locally.")
+def _owner_filter(owner_id):
+    """Match ownerId stored either as ObjectId or as a plain string."""
+    variants = [str(owner_id)]
+    try:
+        variants.append(ObjectId(str(owner_id)))
+    except Exception:
+        pass
+    return {"$in": variants}
 
-    # --- 2. If it was synced, delete it from MongoDB as well ---
-    if synced == 1:
-        try:
-            client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=4000)
-            db = client[MONGO_DB_NAME]
-            col = db["biomassrecords"]
-
-            # Try to delete using both ObjectId and string ownerId for safety
-            delete_result = col.delete_one({
-                "recordId": record_uuid,
-                "$or": [
-                    {"ownerId": ObjectId(str(owner_id))},
-                    {"ownerId": str(owner_id)}
-                ]
-            })
-
-            if delete_result.deleted_count > 0:
-                print("Deleted from MongoDB Atlas.")
-            else:
-                print("No matching MongoDB record found.")
-        except Exception as e:
-            print("Error deleting from MongoDB Atlas:", e)
-    else:
-        print("Record was not synced yet, skipped MongoDB deletion.")
+
+SYNC_BATCH_SIZE = 500
+
+
+class SyncError(Exception):
+    """A sync pass stopped early; `sent` items made it to the cloud before it did."""
+
+    def __init__(self, message, sent=0):
+        super().__init__(message)
+        self.sent = sent
+
+
+def cloud_available(timeout_ms=2000):
+    """Cheap connectivity check through the shared client."""
+    return cloud_health(timeout_ms)[0]
 
 
-def sync_biomass_records(owner_id):
+@metrics.timed("db.get_unsynced_owners_ms")
+def get_unsynced_owners():
+    """Owners that still have records waiting for the cloud."""
+    rows = get_conn().execute("SELECT DISTINCT ownerId FROM biomass_records WHERE synced=0").fetchall()
+    return [r[0] for r in rows]
+
+
+def _record_doc(ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime):
+    """Convert a local biomass_records row into its MongoDB document."""
+    try:
+        mongo_owner_id = ObjectId(str(ownerId))
+    except Exception:
+        mongo_owner_id = str(ownerId)  # fallback if invalid format
+
+    biomass = round(float(biomass), 2) if biomass is not None else 0.0
+    feedMeasurement = round(float(feedMeasurement), 2) if feedMeasurement is not None else 0.0
+    dt = datetime.datetime.fromisoformat(dateTime)
+    return {
+        "ownerId": mongo_owner_id,
+        "recordId": recordId,
+        "shrimpCount": shrimpCount,
+        "biomass": biomass,
+        "feedMeasurement": feedMeasurement,
+        "dateTime": dt,
+        "timestamp_str": dt.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def _get_checkpoint(conn, owner_id):
+    row = conn.execute("SELECT lastSyncedId FROM sync_state WHERE ownerId=?", (owner_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def _mark_synced(conn, owner_id, ids, checkpoint):
+    """Flag exactly these rows as synced and advance the checkpoint, atomically."""
+    with conn:
+        conn.executemany("UPDATE biomass_records SET synced=1 WHERE id=?", [(i,) for i in ids])
+        conn.execute("""
+        INSERT INTO sync_state(ownerId, lastSyncedId) VALUES(?,?)
+        ON CONFLICT(ownerId) DO UPDATE SET lastSyncedId=excluded.lastSyncedId
+        """, (owner_id, checkpoint))
+    _notify("synced", owner_id, ids)
+
+
+@metrics.timed("db.sync_biomass_records_ms")
+def sync_biomass_records(owner_id, batch_size=SYNC_BATCH_SIZE, col=None, progress=None):
     """
-    Sync only the current user's unsynced records to MongoDB Atlas.
-    After syncing, mark them as synced locally.
+    Sync the current user's unsynced records to MongoDB Atlas in batches.
+
+    Rows are streamed from SQLite `batch_size` at a time, starting after the
+    saved checkpoint, and upserted by recordId so a retried batch never creates
+    duplicates. After each batch exactly those rows are marked synced. An
+    interrupted sync resumes from the last completed batch. `col` may be any
+    pymongo-compatible collection (e.g. mongomock); `progress(n)` is called
+    with the running total after each batch. Returns the number of records
+    sent; raises SyncError (carrying that number) if a batch was rejected or
+    the cloud could not be reached, so callers can back off.
     """
-    conn = sqlite3.connect(DB_PATH)
-    rows = conn.execute("""
-        SELECT ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime
-        FROM biomass_records
-        WHERE synced=0 AND ownerId=?
-    """, (owner_id,)).fetchall()
-
-    if not rows:
-        conn.close()
-        print("No unsynced records found for this user.")
-        return 0
+    conn = get_conn()
+    checkpoint = _get_checkpoint(conn, owner_id)
+    n = 0
 
     try:
-        print(f"Preparing to sync {len(rows)} record(s) for user {owner_id}...")
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=4000)
-        db = client[MONGO_DB_NAME]          
-        col = db["biomassrecords"]           
-
-        docs = []
-        for (ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime) in rows:
+        if col is None:
+            col = get_cloud_db()["biomassrecords"]
+
+        while True:
+            rows = conn.execute("""
+                SELECT id, ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime
+                FROM biomass_records
+                WHERE synced=0 AND ownerId=? AND id>?
+                ORDER BY id
+                LIMIT ?
+            """, (owner_id, checkpoint, batch_size)).fetchall()
+            if not rows:
+                break
+
+            ids = [r[0] for r in rows]
+            ops = [
+                UpdateOne({"recordId": r[2]}, {"$set": _record_doc(*r[1:])}, upsert=True)
+                for r in rows
+            ]
             try:
-                mongo_owner_id = ObjectId(str(ownerId))  
-            except Exception:
-                mongo_owner_id = str(ownerId)  # fallback if invalid format
-
-            biomass = round(float(biomass), 2) if biomass is not None else 0.0
-            feedMeasurement = round(float(feedMeasurement), 2) if feedMeasurement is not None else 0.0
-            docs.append({
-                "ownerId": mongo_owner_id,
-                "recordId": recordId,
-                "shrimpCount": shrimpCount,
-                "biomass": biomass,
-                "feedMeasurement": feedMeasurement,
-                "dateTime": datetime.datetime.fromisoformat(dateTime),
-                "timestamp_str": datetime.datetime.fromisoformat(dateTime).strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        if docs:
-            result = col.insert_many(docs)
-            print(f"Inserted {len(result.inserted_ids)} documents into MongoDB Atlas.")
-            conn.execute("UPDATE biomass_records SET synced=1 WHERE ownerId=?", (owner_id,))
-            conn.commit()
-
-        n = len(docs)
+                with pymongo.timeout(MONGO_SYNC_TIMEOUT_MS / 1000):  # a stalled link fails the batch
+                    col.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                # Keep the rows that made it; resume from just before the first failure
+                failed = {err["index"] for err in e.details.get("writeErrors", [])}
+                done = [i for k, i in enumerate(ids) if k not in failed]
+                first_failed = ids[min(failed)] if failed else ids[-1] + 1
+                _mark_synced(conn, owner_id, done, max(checkpoint, first_failed - 1))
+                n += len(done)
+                metrics.incr("sync.records_sent", len(done))
+                metrics.incr("sync.records_rejected", len(failed))
+                if progress:
+                    progress(n)
+                raise SyncError(f"{len(failed)} record(s) rejected by MongoDB Atlas", n) from e
+
+            checkpoint = ids[-1]
+            _mark_synced(conn, owner_id, ids, checkpoint)
+            n += len(ids)
+            metrics.incr("sync.records_sent", len(ids))
+            print(f"Synced batch of {len(ids)} record(s) for user {owner_id}.")
+            if progress:
+                progress(n)
+    except SyncError as e:
+        print("Sync stopped:", e)
+        metrics.incr("sync.errors")
+        raise
     except Exception as e:
         print("Sync error:", e)
-        n = 0
+        metrics.incr("sync.errors")
+        raise SyncError(str(e), n) from e
 
-    conn.close()
+    if n == 0:
+        print("No unsynced records found for this user.")
     return n
 
+
+@metrics.timed("db.sync_deletions_ms")
+def sync_deletions(batch_size=SYNC_BATCH_SIZE, col=None, progress=None):
+    """
+    Push queued deletion tombstones to MongoDB Atlas, one bulk_write per batch.
+    Sent tombstones are kept (flagged synced); failed batches stay queued
+    with their attempt count bumped and are retried on the next call, after
+    SyncError is raised with the number sent so far.
+    """
+    conn = get_conn()
+    n = 0
+    try:
+        if col is None:
+            col = get_cloud_db()["biomassrecords"]
+
+        while True:
+            rows = conn.execute("""
+                SELECT recordId, ownerId FROM deleted_records
+                WHERE synced=0 ORDER BY recordId LIMIT ?
+            """, (batch_size,)).fetchall()
+            if not rows:
+                break
+
+            ops = [DeleteOne({"recordId": rid, "ownerId": _owner_filter(owner)}) for rid, owner in rows]
+            try:
+                with pymongo.timeout(MONGO_SYNC_TIMEOUT_MS / 1000):
+                    result = col.bulk_write(ops, ordered=False)
+            except Exception:
+                with conn:
+                    conn.executemany("UPDATE deleted_records SET attempts=attempts+1 WHERE recordId=?",
+                                     [(r[0],) for r in rows])
+                raise
+
+            with conn:
+                conn.executemany("UPDATE deleted_records SET synced=1 WHERE recordId=?",
+                                 [(r[0],) for r in rows])
+            n += len(rows)
+            metrics.incr("sync.deletions_sent", len(rows))
+            print(f"Deleted {result.deleted_count} of {len(rows)} queued record(s) from MongoDB Atlas.")
+            if progress:
+                progress(n)
+    except Exception as e:
+        print("Deletion sync error:", e)
+        metrics.incr("sync.errors")
+        raise SyncError(str(e), n) from e
+    return n
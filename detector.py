@@ -1,9 +1,15 @@
 import os
 import sys
+import json
 import time
+import hashlib
+import threading
 import cv2
 import numpy as np
 
+import metrics
+from settings import load_env_config
+
 # ---- Ensure ONNXRuntime DLLs load properly (Windows safety) ----
 onnx_dll_path = os.path.join(sys.prefix, "Lib", "site-packages", "onnxruntime", "capi")
 if os.path.exists(onnx_dll_path):
@@ -15,63 +21,341 @@ if os.path.exists(onnx_dll_path):
 import onnxruntime as ort
 
 
+# ---------------------------------------------------------------
+# ONNX Runtime session configuration (config/detector.env + env vars)
+# ---------------------------------------------------------------
+DETECTOR_CONFIG_PATH = "config/detector.env"
+
+DEFAULT_SESSION_CONFIG = {
+    "ORT_PROVIDERS": "CPUExecutionProvider",
+    "ORT_INTRA_OP_THREADS": "0",          # 0 = let ONNX Runtime decide
+    "ORT_INTER_OP_THREADS": "0",
+    "ORT_EXECUTION_MODE": "sequential",   # sequential | parallel
+    "ORT_GRAPH_OPT_LEVEL": "all",         # disable | basic | extended | all
+    "ORT_ENABLE_CPU_MEM_ARENA": "1",
+    "ORT_ENABLE_MEM_PATTERN": "1",
+    "ORT_CACHE_OPTIMIZED_MODEL": "0",     # save/reuse the optimized graph next to the model
+    "ORT_MODEL_PRECISION": "fp32",        # fp32 | int8 (see quantize_model.py)
+    "ORT_INT8_MODEL_PATH": "models/YOLOshrimp.int8.onnx",
+}
+
+GRAPH_OPT_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def load_detector_config(path=DETECTOR_CONFIG_PATH):
+    """ONNX Runtime session settings (see DEFAULT_SESSION_CONFIG for the keys)."""
+    return load_env_config(path, DEFAULT_SESSION_CONFIG)
+
+
+def _flag(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def build_session_options(cfg):
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = int(cfg["ORT_INTRA_OP_THREADS"])
+    so.inter_op_num_threads = int(cfg["ORT_INTER_OP_THREADS"])
+    so.execution_mode = (
+        ort.ExecutionMode.ORT_PARALLEL
+        if cfg["ORT_EXECUTION_MODE"].lower() == "parallel"
+        else ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+    so.graph_optimization_level = GRAPH_OPT_LEVELS[cfg["ORT_GRAPH_OPT_LEVEL"].lower()]
+    so.enable_cpu_mem_arena = _flag(cfg["ORT_ENABLE_CPU_MEM_ARENA"])
+    so.enable_mem_pattern = _flag(cfg["ORT_ENABLE_MEM_PATTERN"])
+    return so
+
+
+def select_providers(cfg):
+    """Requested providers that this onnxruntime build has, always ending with CPU."""
+    available = ort.get_available_providers()
+    wanted = [p.strip() for p in cfg["ORT_PROVIDERS"].split(",") if p.strip()]
+    providers = [p for p in wanted if p in available and p != "CPUExecutionProvider"]
+    providers.append("CPUExecutionProvider")
+
+    options = []
+    for p in providers:
+        if p == "XNNPACKExecutionProvider":
+            # XNNPACK runs its own pool; it gets the thread budget (see create_session)
+            options.append({"intra_op_num_threads": cfg["ORT_INTRA_OP_THREADS"]})
+        else:
+            options.append({})
+    return providers, options
+
+
+def select_model(model_path, cfg):
+    """
+    Model file to load for ORT_MODEL_PRECISION. INT8 uses ORT_INT8_MODEL_PATH
+    and falls back to the FP32 model if the quantized file has not been built.
+    """
+    if cfg["ORT_MODEL_PRECISION"].strip().lower() == "int8":
+        int8_path = cfg["ORT_INT8_MODEL_PATH"]
+        if int8_path and os.path.exists(int8_path):
+            return int8_path
+        print(f" INT8 model {int8_path!r} not found, using FP32 model {model_path}")
+    return model_path
+
+
+# ---------------------------------------------------------------
+# Optimized-graph cache: <model>.opt.onnx plus a .json fingerprint
+# ---------------------------------------------------------------
+def optimized_cache_path(model_path):
+    return os.path.splitext(model_path)[0] + ".opt.onnx"
+
+
+def _model_fingerprint(model_path, providers, cfg):
+    """
+    Identifies what a cached graph was built from: the exact source model,
+    the ORT build, the requested providers and the optimization level.
+    """
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {
+        "source": os.path.abspath(model_path),
+        "size": os.path.getsize(model_path),
+        "sha256": digest.hexdigest(),
+        "onnxruntime": ort.__version__,
+        "providers": list(providers),
+        "graph_opt_level": cfg["ORT_GRAPH_OPT_LEVEL"].lower(),
+    }
+
+
+def _cache_valid(cache_path, fingerprint):
+    try:
+        with open(cache_path + ".json") as f:
+            return os.path.exists(cache_path) and json.load(f) == fingerprint
+    except (OSError, ValueError):
+        return False
+
+
+def _write_optimized_cache(model_path, cache_path, fingerprint, cfg):
+    """
+    Save the graph optimized at BASIC level. Those rewrites (constant folding,
+    redundant node removal) keep standard ONNX ops, so any provider can run
+    the result; EXTENDED and ALL fuse into CPU-only contrib ops and run again
+    whenever the cache is loaded. Files are written under temporary names and
+    renamed into place.
+    """
+    so = build_session_options(cfg)
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    tmp = f"{os.path.splitext(cache_path)[0]}.{os.getpid()}.tmp"
+    so.optimized_model_filepath = tmp + ".onnx"
+    ort.InferenceSession(model_path, sess_options=so, providers=["CPUExecutionProvider"])
+    os.replace(tmp + ".onnx", cache_path)
+    with open(tmp + ".json", "w") as f:
+        json.dump(fingerprint, f)
+    os.replace(tmp + ".json", cache_path + ".json")
+
+
+def create_session(model_path, cfg=None):
+    """
+    Build an InferenceSession from the detector config. With
+    ORT_CACHE_OPTIMIZED_MODEL on, the optimized graph is saved next to the
+    model on first load and reused on later startups for as long as its
+    fingerprint matches the model file, providers and optimization level.
+    With ORT_GRAPH_OPT_LEVEL=disable the model is always loaded as is.
+    """
+    cfg = cfg or load_detector_config()
+    so = build_session_options(cfg)
+    providers, provider_options = select_providers(cfg)
+    if "XNNPACKExecutionProvider" in providers:
+        # Two pools of ORT_INTRA_OP_THREADS each would oversubscribe the cores:
+        # XNNPACK keeps the budget, ORT's own pool only drives the CPU fallback ops
+        so.intra_op_num_threads = 1
+        so.add_session_config_entry("session.intra_op.allow_spinning", "0")
+
+    model_path = select_model(model_path, cfg)
+    if _flag(cfg["ORT_CACHE_OPTIMIZED_MODEL"]) and cfg["ORT_GRAPH_OPT_LEVEL"].lower() != "disable":
+        cache_path = optimized_cache_path(model_path)
+        fingerprint = _model_fingerprint(model_path, providers, cfg)
+        if not _cache_valid(cache_path, fingerprint):
+            try:
+                _write_optimized_cache(model_path, cache_path, fingerprint, cfg)
+            except Exception as e:
+                print(" Could not cache optimized model:", e)
+        if _cache_valid(cache_path, fingerprint):
+            model_path = cache_path
+
+    session = ort.InferenceSession(
+        model_path, sess_options=so,
+        providers=providers, provider_options=provider_options
+    )
+    return session, model_path
+
+
+# ---------------------------------------------------------------
+# Non-maximum suppression (for models exported without NMS)
+# ---------------------------------------------------------------
+def nms_numpy(boxes, scores, iou_thresh=0.45, max_det=300):
+    """Greedy NMS on (N, 4) xyxy boxes; returns kept indices, best score first."""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size > 0 and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        iw = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        ih = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = iw * ih
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_thresh]
+    return np.array(keep, dtype=np.int64)
+
+
+def nms_opencv(boxes, scores, iou_thresh=0.45, max_det=300):
+    """NMS through cv2.dnn.NMSBoxes; same contract as nms_numpy."""
+    xywh = boxes.copy()
+    xywh[:, 2:] -= xywh[:, :2]
+    idx = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), 0.0, iou_thresh)
+    # top_k in NMSBoxes caps the input candidates, so cap the output here
+    return np.array(idx, dtype=np.int64).reshape(-1)[:max_det]
+
+
+NMS_BACKENDS = {
+    "numpy": nms_numpy,
+    "opencv": nms_opencv,
+}
+
+
+def non_max_suppression(boxes, scores, class_ids=None, iou_thresh=0.45,
+                        max_det=300, agnostic=True, backend="opencv"):
+    """
+    Run NMS with the chosen backend (a NMS_BACKENDS key or any callable
+    with the nms_numpy signature). In class-aware mode, boxes of different
+    classes are shifted apart so they never suppress each other.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    nms = NMS_BACKENDS[backend] if isinstance(backend, str) else backend
+    if not agnostic and class_ids is not None:
+        offset = class_ids[:, None] * (boxes.max() + 1)
+        boxes = boxes + offset
+    return nms(boxes, scores, iou_thresh, max_det)
+
+
 class ShrimpDetector:
-    def __init__(self, model_path="models/YOLOshrimp.onnx", conf_thresh=0.25, imgsz=416):
-        """Initialize ONNX model session."""
+    def __init__(self, model_path="models/YOLOshrimp.onnx", conf_thresh=0.25, imgsz=416,
+                 iou_thresh=0.45, max_det=300, agnostic_nms=True, nms_backend="opencv",
+                 session_config=None, use_blob=False, precision=None):
+        """Initialize ONNX model session; `precision` ("fp32"/"int8") overrides ORT_MODEL_PRECISION."""
         self.model_path = model_path
         self.conf_thresh = conf_thresh
         self.imgsz = imgsz
+        self.iou_thresh = iou_thresh
+        self.max_det = max_det
+        self.agnostic_nms = agnostic_nms
+        self.nms_backend = nms_backend
+
+        # Preprocessing buffers, rebuilt only when the input resolution changes
+        self.use_blob = use_blob
+        self._geometry = None
+        self._padded = None
+        self._input = None
+        self._batch = None
+
+        if precision is not None:
+            session_config = dict(session_config or load_detector_config())
+            session_config["ORT_MODEL_PRECISION"] = precision
 
         try:
-            self.session = ort.InferenceSession(
-                model_path, providers=["CPUExecutionProvider"]
-            )
+            self.session, loaded_path = create_session(model_path, session_config)
+            self.loaded_path = loaded_path
             self.input_name = self.session.get_inputs()[0].name
+            # Fixed batch size baked into the model, or None if any batch is accepted
+            dim = self.session.get_inputs()[0].shape[0]
+            self.input_batch = dim if isinstance(dim, int) and dim > 0 else None
             self.output_names = [o.name for o in self.session.get_outputs()]
-            print(f" Loaded ONNX model: {model_path}")
+            print(f" Loaded ONNX model: {loaded_path} ({self.session.get_providers()[0]})")
         except Exception as e:
             print(" Failed to load ONNX model:", e)
             self.session = None
+            self.loaded_path = None
 
     # ---------------------------------------------------------------
     # Preprocess: resize + letterbox (maintain aspect ratio)
     # ---------------------------------------------------------------
     def preprocess(self, frame):
+        """
+        Letterbox `frame` into a reused float32 NCHW buffer. The returned
+        tensor is overwritten by the next call, so copy it if you need to keep it.
+        """
         h, w = frame.shape[:2]
+        if self._geometry is None or self._geometry[0] != (h, w):
+            self._init_buffers(h, w)
+        _, scale, nw, nh, left, top = self._geometry
+
+        # Resize straight into the letterbox ROI; the grey border is never touched
+        roi = self._padded[top:top + nh, left:left + nw]
+        cv2.resize(frame, (nw, nh), dst=roi)
+
+        if self.use_blob:
+            img = cv2.dnn.blobFromImage(self._padded, 1 / 255.0, swapRB=True)
+            return img, scale, left, top
+
+        # BGR -> RGB and HWC -> CHW by channel indexing, scaled without float64
+        for c in range(3):
+            np.divide(self._padded[:, :, 2 - c], np.float32(255.0),
+                      out=self._input[0, c], casting="unsafe")
+        return self._input, scale, left, top
+
+    def _init_buffers(self, h, w):
+        """Cache letterbox geometry and buffers for one input resolution."""
         scale = min(self.imgsz / w, self.imgsz / h)
         nw, nh = int(w * scale), int(h * scale)
-
-        resized = cv2.resize(frame, (nw, nh))
         top = (self.imgsz - nh) // 2
-        bottom = self.imgsz - nh - top
         left = (self.imgsz - nw) // 2
-        right = self.imgsz - nw - left
 
-        padded = cv2.copyMakeBorder(
-            resized, top, bottom, left, right,
-            cv2.BORDER_CONSTANT, value=(114, 114, 114)
-        )
-
-        img = cv2.cvtColor(padded, cv2.COLOR_BGR2RGB)
-        img = img.transpose(2, 0, 1) / 255.0
-        img = np.expand_dims(img, axis=0).astype(np.float32)
-        return img, scale, left, top
+        self._geometry = ((h, w), scale, nw, nh, left, top)
+        self._padded = np.full((self.imgsz, self.imgsz, 3), 114, dtype=np.uint8)
+        self._input = np.empty((1, 3, self.imgsz, self.imgsz), dtype=np.float32)
 
     # ---------------------------------------------------------------
-    # Detect and visualize
+    # Decode raw YOLO rows (x, y, w, h, obj, cls...) in one pass
     # ---------------------------------------------------------------
-    def detect(self, frame, draw=True):
-        if self.session is None:
-            return 0, frame
+    def decode_raw(self, preds, scale, pad_x, pad_y, w, h):
+        """Filter and unmap raw predictions; returns (N, 4) xyxy boxes, (N,) scores and class ids."""
+        cls_scores = preds[:, 5:]
+        class_ids = cls_scores.argmax(axis=1)
+        conf = preds[:, 4] * cls_scores[np.arange(len(preds)), class_ids]
+        keep = conf >= self.conf_thresh
+        preds, conf, class_ids = preds[keep], conf[keep], class_ids[keep]
 
-        h, w = frame.shape[:2]
-        input_tensor, scale, pad_x, pad_y = self.preprocess(frame)
+        xywh = preds[:, :4].astype(np.float64)
+        xy, half = xywh[:, :2], xywh[:, 2:] / 2
+        boxes = np.empty((len(xywh), 4))
+        boxes[:, :2] = xy - half
+        boxes[:, 2:] = xy + half
 
-        # ---- Run inference ----
-        start = time.time()
-        outputs = self.session.run(self.output_names, {self.input_name: input_tensor})
-        inference_time = (time.time() - start) * 1000
+        # Reverse letterbox mapping
+        boxes[:, [0, 2]] -= pad_x
+        boxes[:, [1, 3]] -= pad_y
+        boxes /= scale
+
+        np.maximum(boxes[:, :2], 0, out=boxes[:, :2])
+        np.minimum(boxes[:, 2], w, out=boxes[:, 2])
+        np.minimum(boxes[:, 3], h, out=boxes[:, 3])
+        return boxes, conf, class_ids
 
+    # ---------------------------------------------------------------
+    # Pipeline stages (detect() chains them; benchmarks time them apart)
+    # ---------------------------------------------------------------
+    def infer(self, input_tensor):
+        return self.session.run(self.output_names, {self.input_name: input_tensor})
+
+    def postprocess(self, outputs, scale, pad_x, pad_y, w, h):
+        """Map model outputs to xyxy boxes in original-frame coordinates."""
         detections = []
         out = outputs[0]
 
@@ -93,60 +377,156 @@ class ShrimpDetector:
 
         # Case 2: raw output (no NMS)
         elif len(out.shape) == 3 and out.shape[-1] > 7:
-            preds = out[0]
-            for det in preds:
-                obj_conf = det[4]
-                cls_conf = det[5:].max()
-                conf = obj_conf * cls_conf
-                if conf < self.conf_thresh:
-                    continue
+            boxes, scores, class_ids = self.decode_raw(out[0], scale, pad_x, pad_y, w, h)
+            keep = non_max_suppression(
+                boxes, scores, class_ids,
+                iou_thresh=self.iou_thresh,
+                max_det=self.max_det,
+                agnostic=self.agnostic_nms,
+                backend=self.nms_backend,
+            )
+            detections = boxes[keep]
 
-                x, y, bw, bh = det[:4]
+        return detections
 
-                # Reverse letterbox mapping
-                x1 = (x - bw / 2 - pad_x) / scale
-                y1 = (y - bh / 2 - pad_y) / scale
-                x2 = (x + bw / 2 - pad_x) / scale
-                y2 = (y + bh / 2 - pad_y) / scale
+    def draw(self, frame, detections, inference_time):
+        overlay = frame.copy()
+        for (x1, y1, x2, y2) in detections:
+            cv2.rectangle(
+                overlay,
+                (int(x1), int(y1)),
+                (int(x2), int(y2)),
+                (0, 255, 0),
+                1
+            )
 
-                x1, y1 = max(0, x1), max(0, y1)
-                x2, y2 = min(w, x2), min(h, y2)
-                detections.append((x1, y1, x2, y2))
+        # Semi-transparent overlay
+        frame = cv2.addWeighted(overlay, 0.6, frame, 0.4, 0)
+
+        fps = int(1000 / inference_time) if inference_time > 0 else 0
+        cv2.putText(
+            frame,
+            f"{fps} FPS | Count: {len(detections)}",
+            (15, 40),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1,
+            (0, 255, 0),
+            2,
+        )
+        return frame
+
+    # ---------------------------------------------------------------
+    # Count a batch of frames (offline recounts, no drawing)
+    # ---------------------------------------------------------------
+    def count_batch(self, frames):
+        """
+        Shrimp count per frame. A model with a dynamic batch dimension takes
+        all frames in one session.run; a fixed batch size N gets groups of N,
+        the last one padded with blank frames whose outputs are discarded.
+        """
+        if self.session is None or not frames:
+            return [0] * len(frames)
+        size = self.input_batch or len(frames)
+        if self._batch is None or len(self._batch) != size:
+            self._batch = np.empty((size, 3, self.imgsz, self.imgsz), dtype=np.float32)
+
+        counts = []
+        for start in range(0, len(frames), size):
+            group = frames[start:start + size]
+            geometry = []
+            for i, frame in enumerate(group):
+                input_tensor, scale, pad_x, pad_y = self.preprocess(frame)
+                self._batch[i] = input_tensor[0]
+                geometry.append((scale, pad_x, pad_y, frame.shape[1], frame.shape[0]))
+            self._batch[len(group):] = 0
+
+            outputs = self.infer(self._batch)
+            counts.extend(
+                len(self.postprocess([o[i:i + 1] for o in outputs], scale, pad_x, pad_y, w, h))
+                for i, (scale, pad_x, pad_y, w, h) in enumerate(geometry)
+            )
+        return counts
+
+    # ---------------------------------------------------------------
+    # Detect and visualize
+    # ---------------------------------------------------------------
+    def detect(self, frame, draw=True):
+        if self.session is None:
+            return 0, frame
+
+        start = time.perf_counter()
+        h, w = frame.shape[:2]
+        with metrics.timer("detect.preprocess_ms"):
+            input_tensor, scale, pad_x, pad_y = self.preprocess(frame)
+
+        # ---- Run inference ----
+        t_infer = time.perf_counter()
+        outputs = self.infer(input_tensor)
+        inference_time = (time.perf_counter() - t_infer) * 1000
+        metrics.observe("detect.infer_ms", inference_time)
 
+        with metrics.timer("detect.postprocess_ms"):
+            detections = self.postprocess(outputs, scale, pad_x, pad_y, w, h)
         count = len(detections)
 
         # ---- Draw bounding boxes ----
         if draw:
-            overlay = frame.copy()
-            for (x1, y1, x2, y2) in detections:
-                cv2.rectangle(
-                    overlay,
-                    (int(x1), int(y1)),
-                    (int(x2), int(y2)),
-                    (0, 255, 0),
-                    1
-                )
-
-            # Semi-transparent overlay
-            frame = cv2.addWeighted(overlay, 0.6, frame, 0.4, 0)
-
-            fps = int(1000 / inference_time) if inference_time > 0 else 0
-            cv2.putText(
-                frame,
-                f"{fps} FPS | Count: {count}",
-                (15, 40),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1,
-                (0, 255, 0),
-                2,
-            )
+            with metrics.timer("detect.draw_ms"):
+                frame = self.draw(frame, detections, inference_time)
+
+        metrics.incr("detect.frames")
+        metrics.observe("detect.count", count)
+        metrics.observe("detect.total_ms", (time.perf_counter() - start) * 1000)
+
+        # Overlay stays BGR; VideoLabel wraps it as BGR888 without converting
+        return count, frame
+
+
+# ---------------------------------------------------------------
+# Shared detector: load the model once per process
+# ---------------------------------------------------------------
+_detector = None
+_detector_lock = threading.Lock()
+_detector_ready = threading.Event()
+_detector_load_ms = None
+
+
+def _load_shared_detector(**kwargs):
+    global _detector, _detector_load_ms
+    with _detector_lock:
+        if _detector is None:
+            start = time.perf_counter()
+            _detector = ShrimpDetector(**kwargs)
+            _detector_load_ms = (time.perf_counter() - start) * 1000
+            print(f" Shared detector ready in {_detector_load_ms:.0f} ms")
+            _detector_ready.set()
+    return _detector
+
+
+def preload_detector(**kwargs):
+    """Start loading the shared detector in the background (e.g. behind the login screen)."""
+    if not _detector_ready.is_set():
+        threading.Thread(target=_load_shared_detector, kwargs=kwargs, daemon=True).start()
+
+
+def get_detector(**kwargs):
+    """Return the shared detector, loading it now (or waiting for preload) if needed."""
+    if _detector_ready.is_set():
+        return _detector
+    return _load_shared_detector(**kwargs)
+
+
+def detector_ready():
+    return _detector_ready.is_set()
+
 
-        # Return frame as RGB for PyQt display
-        return count, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+def detector_load_time():
+    """Model load time in ms, or None while still loading."""
+    return _detector_load_ms
 
 
 # ---------------------------------------------------------------
-# Stand-alone camera test (optional)
+# Stand-alone camera test (optional; batch_count.py recounts files)
 # ---------------------------------------------------------------
 if __name__ == "__main__":
     detector = ShrimpDetector("models/YOLOshrimp.onnx", conf_thresh=0.25, imgsz=416)
@@ -158,7 +538,7 @@ if __name__ == "__main__":
             break
 
         count, vis = detector.detect(frame, draw=True)
-        cv2.imshow("Shrimp Detector", cv2.cvtColor(vis, cv2.COLOR_RGB2BGR))
+        cv2.imshow("Shrimp Detector", vis)
         if cv2.waitKey(1) == 27:
             break
 
@@ -0,0 +1,33 @@
+import cv2
+import numpy as np
+from PyQt5 import QtGui
+
+# Frame -> screen conversion shared by the live screen (ui_biomass.VideoLabel)
+# and the replay benchmark (bench_pipeline.py). Import-time side effects
+# (exception hooks, QApplication) belong to the callers, not here.
+
+VIDEO_SIZE = (880, 460)  # live video area, in pixels
+
+
+class FrameConverter:
+    """
+    BGR frame -> QImage fitted into a box: one resize into a cached buffer,
+    wrapped as BGR888 without a colour conversion. The QImage shares the
+    buffer, so turn it into a pixmap before the next convert().
+    """
+    def __init__(self):
+        self._target = None       # (frame size, box size) -> display size
+        self._display = None      # reused BGR buffer at display size
+
+    def convert(self, frame, box_w, box_h):
+        h, w = frame.shape[:2]
+        key = ((w, h), (box_w, box_h))
+        if self._target is None or self._target[0] != key:
+            scale = min(box_w / w, box_h / h)
+            tw, th = max(1, int(w * scale)), max(1, int(h * scale))
+            self._target = (key, (tw, th))
+            self._display = np.empty((th, tw, 3), dtype=np.uint8)
+        tw, th = self._target[1]
+
+        cv2.resize(frame, (tw, th), dst=self._display, interpolation=cv2.INTER_LINEAR)
+        return QtGui.QImage(self._display.data, tw, th, 3 * tw, QtGui.QImage.Format_BGR888)
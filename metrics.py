@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import bisect
+import threading
+import functools
+import logging
+from logging.handlers import RotatingFileHandler
+
+from settings import load_env_config
+
+
+# ------------------------
+# Configuration
+# ------------------------
+METRICS_CONFIG_PATH = "config/metrics.env"
+
+DEFAULT_METRICS_CONFIG = {
+    "METRICS_ENABLED": "1",
+    "METRICS_FILE": "logs/metrics.jsonl",
+    "METRICS_INTERVAL_S": "60",       # how often a snapshot is appended to the file
+    "METRICS_MAX_BYTES": "1048576",   # rotate the file at this size
+    "METRICS_BACKUPS": "5",           # rotated files kept
+}
+
+
+def load_metrics_config(path=METRICS_CONFIG_PATH):
+    """Metrics settings; environment variables override the file."""
+    return load_env_config(path, DEFAULT_METRICS_CONFIG)
+
+
+# ---------------------------------------------------------------
+# Instruments
+# ---------------------------------------------------------------
+# Fixed log-spaced bucket bounds (1.25x apart, ~0.01 to ~90000): recording
+# is one bisect, memory is constant however long the device runs.
+BUCKETS = [round(0.01 * 1.25 ** i, 4) for i in range(72)]
+
+
+class Histogram:
+    """Count/sum/min/max plus bucket counts; percentiles are bucket upper bounds."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                bound = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_started = time.time()
+enabled = True
+
+
+def configure(cfg=None):
+    """Apply METRICS_ENABLED from the config (called at import)."""
+    global enabled
+    cfg = cfg or load_metrics_config()
+    enabled = str(cfg["METRICS_ENABLED"]).strip().lower() in ("1", "true", "yes", "on")
+
+
+def incr(name, n=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name, value):
+    """Record a value (timings are in milliseconds) into the named histogram."""
+    if not enabled:
+        return
+    with _lock:
+        h = _histograms.get(name)
+        if h is None:
+            h = _histograms[name] = Histogram()
+        h.observe(value)
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """`with metrics.timer("x"):` records the block's duration in ms under x."""
+    return _Timer(name) if enabled else _NULL_TIMER
+
+
+def timed(name):
+    """Decorator form of timer(); also counts calls that raised under `<name>.errors`."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                incr(name + ".errors")
+                raise
+            finally:
+                observe(name, (time.perf_counter() - start) * 1000)
+        return inner
+    return wrap
+
+
+def snapshot():
+    """Current values of every counter and histogram summary."""
+    with _lock:
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "uptime_s": round(time.time() - _started, 1),
+            "counters": dict(_counters),
+            "histograms": {name: h.summary() for name, h in _histograms.items()},
+        }
+
+
+def reset():
+    global _started
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _started = time.time()
+
+
+configure()
+
+
+# ---------------------------------------------------------------
+# Periodic writer: one JSON snapshot per line, rotating file
+# ---------------------------------------------------------------
+class MetricsWriter(threading.Thread):
+    def __init__(self, path, interval=60, max_bytes=1048576, backups=5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.stopped = threading.Event()
+
+    def write(self):
+        record = logging.makeLogRecord({"msg": json.dumps(snapshot()), "levelno": logging.INFO})
+        self.handler.handle(record)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.write()
+            except Exception as e:
+                print("Metrics write error:", e)
+
+    def stop(self):
+        self.stopped.set()
+        self.join(timeout=1.0)
+        try:
+            self.write()  # final snapshot on shutdown
+        except Exception as e:
+            print("Metrics write error:", e)
+        self.handler.close()
+
+
+_writer = None
+
+
+def start_metrics_writer(cfg=None):
+    global _writer
+    cfg = cfg or load_metrics_config()
+    if _writer is None and enabled:
+        _writer = MetricsWriter(
+            cfg["METRICS_FILE"],
+            interval=float(cfg["METRICS_INTERVAL_S"]),
+            max_bytes=int(cfg["METRICS_MAX_BYTES"]),
+            backups=int(cfg["METRICS_BACKUPS"]),
+        )
+        _writer.start()
+    return _writer
+
+
+def stop_metrics_writer():
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
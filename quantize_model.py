@@ -0,0 +1,118 @@
+import os
+import sys
+import argparse
+import tempfile
+import cv2
+
+from onnxruntime.quantization import (
+    CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+from camera import ReplayCamera
+from detector import ShrimpDetector, load_detector_config
+
+# Build the static INT8 model used when ORT_MODEL_PRECISION=int8. Example:
+#   python quantize_model.py calib_frames/ --model models/YOLOshrimp.onnx
+# Calibrate on pond frames that are NOT in the held-out set used by
+# bench_quant.py, then compare before switching devices over.
+
+CALIB_METHODS = {
+    "minmax": CalibrationMethod.MinMax,
+    "entropy": CalibrationMethod.Entropy,
+    "percentile": CalibrationMethod.Percentile,
+}
+
+
+def sample_images(folder, limit):
+    """Up to `limit` images spread evenly over the (sorted) folder."""
+    files = ReplayCamera(folder).images
+    if limit and len(files) > limit:
+        step = len(files) / limit
+        files = [files[int(i * step)] for i in range(limit)]
+    return files
+
+
+class PondFrameReader(CalibrationDataReader):
+    """
+    Feeds calibration frames letterboxed exactly like ShrimpDetector.preprocess,
+    one image at a time, so memory does not grow with the folder size.
+    """
+
+    def __init__(self, files, model_path, imgsz):
+        # Plain FP32 session, only used for its preprocessing and input name
+        cfg = load_detector_config()
+        cfg["ORT_CACHE_OPTIMIZED_MODEL"] = "0"
+        self.detector = ShrimpDetector(model_path, imgsz=imgsz, session_config=cfg, precision="fp32")
+        if self.detector.session is None:
+            raise SystemExit(f"Could not load {model_path}")
+        self.files = iter(files)
+        self.total = len(files)
+        self.done = 0
+
+    def get_next(self):
+        for f in self.files:
+            frame = cv2.imread(f)
+            if frame is None:
+                print(f"Skipping unreadable image: {f}", file=sys.stderr)
+                continue
+            tensor, _, _, _ = self.detector.preprocess(frame)
+            self.done += 1
+            if self.done % 50 == 0:
+                print(f"Calibrated on {self.done}/{self.total} frame(s)", file=sys.stderr)
+            return {self.detector.input_name: tensor.copy()}  # preprocess reuses its buffer
+        return None
+
+
+def quantize(model_path, calib_dir, out_path, imgsz=416, limit=300, method="minmax",
+             per_channel=True, fmt="qdq", nodes_to_exclude=None, skip_preprocess=False):
+    files = sample_images(calib_dir, limit)
+    if not files:
+        raise SystemExit(f"No calibration images in {calib_dir}")
+    print(f"Calibrating on {len(files)} frame(s) from {calib_dir} ({method})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = model_path
+        if not skip_preprocess:
+            # Shape inference + graph cleanup; improves quantization coverage.
+            # ONNX shape inference is enough for the exported model, so the
+            # symbolic pass (and its sympy dependency) is skipped.
+            source = os.path.join(tmp, "prep.onnx")
+            quant_pre_process(model_path, source, skip_symbolic_shape=True)
+
+        quantize_static(
+            source, out_path,
+            PondFrameReader(files, model_path, imgsz),
+            quant_format=QuantFormat.QDQ if fmt == "qdq" else QuantFormat.QOperator,
+            per_channel=per_channel,
+            activation_type=QuantType.QUInt8,   # U8S8: the fast path for ORT's CPU kernels
+            weight_type=QuantType.QInt8,
+            calibrate_method=CALIB_METHODS[method],
+            nodes_to_exclude=nodes_to_exclude or [],
+            # Bound calibration memory: reduce collected ranges every N batches
+            extra_options={"CalibMaxIntermediateOutputs": 32},
+        )
+
+    size = os.path.getsize(out_path) / 1e6
+    print(f"Wrote {out_path} ({size:.1f} MB, FP32 was {os.path.getsize(model_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    cfg = load_detector_config()
+    parser = argparse.ArgumentParser(description="Build a static INT8 YOLOshrimp model calibrated on pond frames.")
+    parser.add_argument("calib_dir", help="folder of representative pond frames (not the held-out set)")
+    parser.add_argument("--model", default="models/YOLOshrimp.onnx", help="FP32 source model")
+    parser.add_argument("--out", default=cfg["ORT_INT8_MODEL_PATH"])
+    parser.add_argument("--imgsz", type=int, default=416)
+    parser.add_argument("--limit", type=int, default=300, help="max calibration frames (0 = all)")
+    parser.add_argument("--method", choices=CALIB_METHODS, default="minmax")
+    parser.add_argument("--per-tensor", action="store_true", help="per-tensor instead of per-channel weights")
+    parser.add_argument("--format", choices=["qdq", "qoperator"], default="qdq")
+    parser.add_argument("--exclude", nargs="*", default=[], metavar="NODE",
+                        help="node names to keep in FP32 (e.g. the detection head)")
+    parser.add_argument("--skip-preprocess", action="store_true", help="skip quant_pre_process")
+    args = parser.parse_args()
+
+    quantize(args.model, args.calib_dir, args.out, imgsz=args.imgsz, limit=args.limit,
+             method=args.method, per_channel=not args.per_tensor, fmt=args.format,
+             nodes_to_exclude=args.exclude, skip_preprocess=args.skip_preprocess)
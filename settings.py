@@ -0,0 +1,22 @@
+import os
+
+# One parser for the config/*.env files (detector.env, metrics.env, config.env).
+
+
+def load_env_config(path, defaults):
+    """
+    Read KEY=VALUE lines from `path` over `defaults`; blank lines and
+    # comments are skipped. Environment variables win over both.
+    """
+    cfg = dict(defaults)
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    cfg[key.strip()] = value.strip()
+    for key in cfg:
+        if key in os.environ:
+            cfg[key] = os.environ[key]
+    return cfg
@@ -0,0 +1,129 @@
+import random
+import threading
+from PyQt5 import QtCore
+
+import metrics
+from database import (cloud_available, get_unsynced_owners, sync_biomass_records, sync_deletions, close_conn,
+                      SyncError)
+
+
+def sync_pending_records(progress):
+    """Push every owner's unsynced biomass records; returns how many were sent."""
+    total = 0
+    for owner_id in get_unsynced_owners():
+        try:
+            total += sync_biomass_records(owner_id, progress=lambda n, base=total: progress(base + n))
+        except SyncError as e:
+            raise SyncError(str(e), total + e.sent) from e
+    return total
+
+
+class SyncService(QtCore.QThread):
+    """
+    Background cloud sync. Runs every `interval` seconds (or right away on
+    sync_now()), checks connectivity first and backs off exponentially with
+    jitter while offline. Results reach the UI only through signals.
+    """
+    status = QtCore.pyqtSignal(str)
+    progress = QtCore.pyqtSignal(int)       # records sent so far in this cycle
+    cycle_done = QtCore.pyqtSignal(int)     # records sent in the finished cycle
+
+    def __init__(self, interval=300, base_delay=5, max_delay=600):
+        super().__init__()
+        self.interval = interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Each task takes a progress callback and returns a count of items sent.
+        # Deletions go last so they win over an upload of the same record.
+        self.tasks = [sync_pending_records, lambda progress: sync_deletions(progress=progress)]
+        self.failures = 0
+        self.running = False
+        self.wake = threading.Event()
+
+    def run(self):
+        self.running = True
+        while self.running:
+            if not cloud_available():
+                metrics.incr("sync.offline")
+                delay = self._backoff()
+                self.status.emit(f"Offline - retrying in {delay:.0f}s")
+                self._sleep(delay)
+                continue
+
+            self.status.emit("Syncing...")
+            sent, failed = 0, False
+            with metrics.timer("sync.cycle_ms"):
+                for task in self.tasks:
+                    try:
+                        sent += task(lambda n, base=sent: self.progress.emit(base + n))
+                    except SyncError as e:
+                        sent += e.sent  # partial progress is kept; the rest is retried
+                        failed = True
+                        print("Background sync error:", e)
+                    except Exception as e:
+                        failed = True
+                        print("Background sync error:", e)
+                        metrics.incr("sync.errors")
+            metrics.incr("sync.cycles")
+            self.cycle_done.emit(sent)
+
+            # Write errors back off just like a failed ping
+            if failed:
+                delay = self._backoff()
+                self.status.emit(f"Sync failed after {sent} item(s) - retrying in {delay:.0f}s")
+                self._sleep(delay)
+            else:
+                self.failures = 0
+                self.status.emit(f"Last sync: {sent} item(s) sent")
+                self._sleep(self.interval)
+        close_conn()
+
+    def _backoff(self):
+        """Next retry delay: exponential in consecutive failures, with jitter."""
+        self.failures += 1
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+        return delay * random.uniform(0.5, 1.0)  # jitter so devices don't retry in lockstep
+
+    def _sleep(self, seconds):
+        self.wake.wait(seconds)
+        self.wake.clear()
+
+    def sync_now(self):
+        """Skip the current wait (including any backoff) and sync immediately."""
+        self.failures = 0
+        self.wake.set()
+
+    def stop(self, timeout=5.0):
+        """Ask the loop to exit and wait at most `timeout` seconds; True if it did."""
+        self.running = False
+        self.wake.set()
+        if self.wait(int(timeout * 1000)):
+            return True
+        # Every cloud call has its own time limit, so the thread ends soon after
+        print(f"Sync service still busy after {timeout:.0f}s; not waiting for it")
+        return False
+
+
+# ---------------------------------------------------------------
+# Process-wide service, started from app.main()
+# ---------------------------------------------------------------
+_service = None
+
+
+def start_sync_service(**kwargs):
+    global _service
+    if _service is None:
+        _service = SyncService(**kwargs)
+        _service.start()
+    return _service
+
+
+def get_sync_service():
+    return _service
+
+
+def stop_sync_service(timeout=5.0):
+    global _service
+    if _service is not None:
+        _service.stop(timeout)
+        _service = None
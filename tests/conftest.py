@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+@pytest.fixture
+def local_db(tmp_path, monkeypatch):
+    """Fresh local SQLite database (schema + migrations) in a temp dir."""
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "local.db"))
+    database.init_db()
+    yield database.get_conn()
+    database.close_conn()
+
+
+@pytest.fixture
+def cloud_db(monkeypatch):
+    """In-memory MongoDB stand-in returned by database.get_cloud_db()."""
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["test"]
+    monkeypatch.setattr(database, "get_cloud_db", lambda: db)
+    return db
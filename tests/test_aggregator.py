@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from aggregator import CountAggregator
+
+
+@pytest.mark.parametrize("n, lo_rank, hi_rank", [
+    (50, 18, 33),   # 1-based order statistics k..n-k+1 at 95%
+    (20, 5, 16),
+    (100, 40, 61),
+])
+def test_median_interval_ranks(n, lo_rank, hi_rank):
+    # Distinct values 0..n-1, so the value at 0-based rank r is r itself
+    agg = CountAggregator(window=n, confidence=0.95)
+    values = list(range(n))
+    random.Random(n).shuffle(values)
+    for v in values:
+        agg.add(v)
+    assert agg.confidence_interval() == (lo_rank - 1, hi_rank - 1)
+
+
+def test_median_interval_is_symmetric():
+    for n in range(1, 200):
+        agg = CountAggregator(window=n)
+        for v in range(n):
+            agg.add(v)
+        lo, hi = agg.confidence_interval()
+        assert lo + hi == n - 1
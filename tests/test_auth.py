@@ -0,0 +1,73 @@
+import bcrypt
+import pytest
+
+import database
+
+
+def hashed(password):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+
+
+def add_cloud_user(cloud_db, password, username="operator"):
+    _id = cloud_db["users"].insert_one(
+        {"username": username, "email": f"{username}@farm.test", "password": hashed(password)}
+    ).inserted_id
+    return str(_id)
+
+
+def test_revalidate_replaces_hash_changed_in_cloud(local_db, cloud_db):
+    uid = add_cloud_user(cloud_db, "old-pw")
+    assert database.verify_cloud_user("operator", "old-pw") == uid
+    assert database.verify_local_user("operator", "old-pw") == uid
+
+    cloud_db["users"].update_one({"username": "operator"}, {"$set": {"password": hashed("new-pw")}})
+    database._revalidate("operator")
+
+    assert database.verify_local_user("operator", "old-pw") is None
+    assert database.verify_local_user("operator", "new-pw") == uid
+
+
+def test_revalidate_removes_user_deleted_in_cloud(local_db, cloud_db):
+    uid = add_cloud_user(cloud_db, "pw")
+    assert database.verify_cloud_user("operator", "pw") == uid
+
+    cloud_db["users"].delete_one({"username": "operator"})
+    database._revalidate("operator")
+
+    assert database.verify_local_user("operator", "pw") is None
+    assert database.get_conn().execute("SELECT COUNT(*) FROM users WHERE username='operator'").fetchone()[0] == 0
+
+
+def test_revalidate_keeps_offline_admin(local_db, cloud_db):
+    database._revalidate("admin")
+    assert database.verify_local_user("admin", "admin") == database.LOCAL_ADMIN_ID
+
+
+def test_revalidate_keeps_cache_while_cloud_unreachable(local_db, cloud_db, monkeypatch):
+    uid = add_cloud_user(cloud_db, "pw")
+    database.verify_cloud_user("operator", "pw")
+
+    def offline():
+        raise ConnectionError("no route to cluster")
+    monkeypatch.setattr(database, "get_cloud_db", offline)
+    database._revalidate("operator")
+
+    assert database.verify_local_user("operator", "pw") == uid
+
+
+def test_login_worker_reports_failure_when_check_raises(monkeypatch):
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    qapp = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    import app
+
+    def broken(username, password):
+        raise ValueError("Invalid salt")
+    monkeypatch.setattr(app, "verify_user", broken)
+
+    worker = app.LoginWorker("operator", "pw")
+    results = []
+    worker.done.connect(results.append)
+    worker.start()
+    assert worker.wait(5000)
+    qapp.processEvents()
+    assert results == [None]
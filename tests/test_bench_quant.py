@@ -0,0 +1,18 @@
+from bench_quant import count_errors
+
+
+def test_count_errors_against_reference():
+    pred = {"a.jpg": 10, "b.jpg": 12, "c.jpg": 7}
+    ref = {"a.jpg": 10, "b.jpg": 10, "c.jpg": 8, "d.jpg": 5}
+    e = count_errors(pred, ref)
+    assert e["frames"] == 3
+    assert e["mae"] == 1.0
+    assert e["max_abs_error"] == 2
+    assert e["exact_pct"] == 33.3
+    assert e["bias_pct"] == 3.57
+
+
+def test_count_errors_without_matching_files():
+    e = count_errors({"a.jpg": 3}, {"frame_0001.png": 3})
+    assert e["frames"] == 0
+    assert "no matching" in e["error"]
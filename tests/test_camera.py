@@ -0,0 +1,42 @@
+import threading
+import time
+
+import camera
+
+
+class StuckCapture:
+    """VideoCapture stand-in whose read() blocks like a stalled USB camera."""
+
+    def __init__(self):
+        self.unblock = threading.Event()
+        self.reading = False
+        self.released = False
+        self.released_mid_read = False
+
+    def set(self, prop, value):
+        return True
+
+    def read(self):
+        self.reading = True
+        self.unblock.wait(5)
+        self.reading = False
+        return False, None
+
+    def release(self):
+        self.released_mid_read |= self.reading
+        self.released = True
+
+
+def test_release_waits_for_a_blocked_read(monkeypatch):
+    cap = StuckCapture()
+    monkeypatch.setattr(camera.cv2, "VideoCapture", lambda index: cap)
+    cam = camera.Camera(threaded=True)
+    time.sleep(0.05)
+    grabber = cam.thread
+
+    cam.release()
+    assert not cap.released            # still inside read(): not safe to release yet
+
+    cap.unblock.set()
+    grabber.join(2)
+    assert cap.released and not cap.released_mid_read
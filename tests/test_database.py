@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+def tombstones(conn):
+    return conn.execute("SELECT recordId, ownerId, synced FROM deleted_records ORDER BY recordId").fetchall()
+
+
+def test_delete_leaves_a_tombstone_per_owned_record(local_db):
+    mine = [database.save_biomass_record("u1", n, 1.0, 0.1) for n in range(3)]
+    theirs = database.save_biomass_record("u2", 9, 1.0, 0.1)
+    record_ids = dict(local_db.execute("SELECT id, recordId FROM biomass_records").fetchall())
+
+    assert database.delete_records(mine[:2] + [theirs], "u1") == 2
+
+    assert tombstones(local_db) == sorted((record_ids[i], "u1", 0) for i in mine[:2])
+    left = [r[0] for r in local_db.execute("SELECT id FROM biomass_records ORDER BY id")]
+    assert left == [mine[2], theirs]
+
+
+def test_failed_delete_writes_no_tombstone(local_db):
+    ids = [database.save_biomass_record("u1", n, 1.0, 0.1) for n in range(3)]
+    local_db.execute("""CREATE TEMP TRIGGER fail_delete BEFORE DELETE ON biomass_records
+                        WHEN OLD.id = %d BEGIN SELECT RAISE(ABORT, 'disk gone'); END""" % ids[1])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        database.delete_records(ids, "u1")
+
+    # Tombstones and deletes commit together or not at all
+    assert tombstones(local_db) == []
+    assert local_db.execute("SELECT COUNT(*) FROM biomass_records").fetchone()[0] == 3
+
+
+ROLLUP_FROM_RECORDS = """
+    SELECT ownerId, substr(dateTime, 1, 10), COUNT(*), SUM(shrimpCount),
+           ROUND(SUM(biomass), 6), ROUND(SUM(feedMeasurement), 6)
+    FROM biomass_records GROUP BY 1, 2 ORDER BY 1, 2
+"""
+ROLLUP_TABLE = """
+    SELECT ownerId, day, records, totalCount, ROUND(totalBiomass, 6), ROUND(totalFeed, 6)
+    FROM biomass_daily ORDER BY 1, 2
+"""
+
+
+def add_record(conn, owner, day, count, biomass, feed):
+    with conn:
+        return conn.execute("""
+        INSERT INTO biomass_records(ownerId, recordId, shrimpCount, biomass, feedMeasurement, dateTime, synced)
+        VALUES(?, lower(hex(randomblob(8))), ?, ?, ?, ?, 0)
+        """, (owner, count, biomass, feed, f"{day}T08:00:00")).lastrowid
+
+
+def test_daily_rollup_follows_inserts_and_deletes(local_db):
+    ids = []
+    for n in range(12):
+        owner = "u1" if n % 3 else "u2"
+        ids.append(add_record(local_db, owner, f"2026-10-{10 + n % 4:02d}", n * 5, n * 0.5, n * 0.05))
+    assert local_db.execute(ROLLUP_TABLE).fetchall() == local_db.execute(ROLLUP_FROM_RECORDS).fetchall()
+
+    database.delete_records(ids[::2], "u1")
+    database.delete_records(ids[::2], "u2")
+    assert local_db.execute(ROLLUP_TABLE).fetchall() == local_db.execute(ROLLUP_FROM_RECORDS).fetchall()
+
+    # Deleting a day's last record removes its rollup row instead of leaving zeros
+    with local_db:
+        local_db.execute("DELETE FROM biomass_records")
+    assert local_db.execute("SELECT COUNT(*) FROM biomass_daily").fetchone()[0] == 0
@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+import pytest
+
+import detector
+
+
+def conv_relu_model(path, batch=1):
+    """Conv followed by Relu: EXTENDED-level optimization fuses these into FusedConv."""
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper, numpy_helper
+
+    w = numpy_helper.from_array(np.ones((4, 3, 3, 3), dtype=np.float32), "W")
+    graph = helper.make_graph(
+        [helper.make_node("Conv", ["x", "W"], ["c"]), helper.make_node("Relu", ["c"], ["y"])],
+        "conv_relu",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, [batch, 3, 8, 8])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, None)],
+        [w],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return str(path)
+
+
+def cache_config(**overrides):
+    cfg = dict(detector.DEFAULT_SESSION_CONFIG, ORT_CACHE_OPTIMIZED_MODEL="1")
+    cfg.update(overrides)
+    return cfg
+
+
+def test_cached_graph_uses_standard_ops_only(tmp_path):
+    onnx = pytest.importorskip("onnx")
+    model = conv_relu_model(tmp_path / "m.onnx")
+
+    _, loaded = detector.create_session(model, cache_config())
+
+    assert loaded == detector.optimized_cache_path(model)
+    assert {n.domain for n in onnx.load(loaded).graph.node} == {""}
+
+
+def test_cache_rebuilt_when_providers_or_level_change(tmp_path):
+    model = conv_relu_model(tmp_path / "m.onnx")
+    cache = detector.optimized_cache_path(model)
+    detector.create_session(model, cache_config())
+
+    with open(cache + ".json") as f:
+        assert json.load(f)["graph_opt_level"] == "all"
+    detector.create_session(model, cache_config(ORT_GRAPH_OPT_LEVEL="extended"))
+    with open(cache + ".json") as f:
+        assert json.load(f)["graph_opt_level"] == "extended"
+
+    cfg = cache_config(ORT_GRAPH_OPT_LEVEL="extended")
+    providers, _ = detector.select_providers(cfg)
+    assert detector._cache_valid(cache, detector._model_fingerprint(model, providers, cfg))
+    other = ["XNNPACKExecutionProvider"] + providers
+    assert not detector._cache_valid(cache, detector._model_fingerprint(model, other, cfg))
+
+
+def test_disabled_optimization_skips_cache(tmp_path):
+    model = conv_relu_model(tmp_path / "m.onnx")
+    detector.create_session(model, cache_config())
+
+    _, loaded = detector.create_session(model, cache_config(ORT_GRAPH_OPT_LEVEL="disable"))
+    assert loaded == model
+
+
+def test_count_batch_of_no_frames(tmp_path):
+    model = conv_relu_model(tmp_path / "m.onnx", batch="N")
+    det = detector.ShrimpDetector(model, imgsz=8, session_config=dict(detector.DEFAULT_SESSION_CONFIG))
+    assert det.session is not None and det.input_batch is None
+
+    assert det.count_batch([]) == []
+
+
+def reference_preprocess(frame, imgsz):
+    """The original copyMakeBorder/cvtColor/float64 letterbox, kept as the reference."""
+    cv2 = pytest.importorskip("cv2")
+    h, w = frame.shape[:2]
+    scale = min(imgsz / w, imgsz / h)
+    nw, nh = int(w * scale), int(h * scale)
+    resized = cv2.resize(frame, (nw, nh))
+    top = (imgsz - nh) // 2
+    bottom = imgsz - nh - top
+    left = (imgsz - nw) // 2
+    right = imgsz - nw - left
+    padded = cv2.copyMakeBorder(resized, top, bottom, left, right,
+                                cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    img = cv2.cvtColor(padded, cv2.COLOR_BGR2RGB)
+    img = img.transpose(2, 0, 1) / 255.0
+    img = np.expand_dims(img, axis=0).astype(np.float32)
+    return img, scale, left, top
+
+
+def test_preprocess_matches_reference_bit_for_bit(tmp_path):
+    det = detector.ShrimpDetector(str(tmp_path / "none.onnx"), imgsz=416)  # no session needed
+    rng = np.random.default_rng(0)
+    # Each resolution twice: once building the buffers, once reusing them
+    for shape in [(480, 640), (480, 640), (720, 1280), (333, 517), (416, 416), (480, 640)]:
+        frame = rng.integers(0, 256, (*shape, 3), dtype=np.uint8)
+        tensor, scale, left, top = det.preprocess(frame)
+        ref, ref_scale, ref_left, ref_top = reference_preprocess(frame, 416)
+        assert (scale, left, top) == (ref_scale, ref_left, ref_top)
+        assert tensor.dtype == np.float32 and tensor.shape == ref.shape
+        assert np.array_equal(tensor, ref)
+
+
+@pytest.mark.parametrize("n, seed", [(50, 0), (500, 1), (2000, 2)])
+def test_nms_backends_agree(n, seed):
+    from bench_nms import make_candidates
+    boxes, scores = make_candidates(n, seed=seed)
+    class_ids = np.random.default_rng(seed).integers(0, 3, size=n)
+
+    for kwargs in [{}, {"agnostic": False, "class_ids": class_ids}, {"max_det": 10}, {"iou_thresh": 0.7}]:
+        keep_np = detector.non_max_suppression(boxes, scores, backend="numpy", **kwargs)
+        keep_cv = detector.non_max_suppression(boxes, scores, backend="opencv", **kwargs)
+        assert len(keep_np) > 0
+        assert keep_np.tolist() == keep_cv.tolist()  # same boxes, both best score first
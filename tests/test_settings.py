@@ -0,0 +1,16 @@
+from settings import load_env_config
+
+
+def test_file_overrides_defaults_and_environment_wins(tmp_path, monkeypatch):
+    path = tmp_path / "x.env"
+    path.write_text("# comment\n\nA = from-file\nURI=mongodb+srv://h/?w=majority&x=1\nNOEQUALS\n")
+    monkeypatch.setenv("B", "from-env")
+
+    cfg = load_env_config(str(path), {"A": "default", "B": "default", "C": "default"})
+
+    assert cfg == {"A": "from-file", "B": "from-env", "C": "default",
+                   "URI": "mongodb+srv://h/?w=majority&x=1"}
+
+
+def test_missing_file_gives_defaults(tmp_path):
+    assert load_env_config(str(tmp_path / "none.env"), {"A": "1"}) == {"A": "1"}
@@ -0,0 +1,155 @@
+import threading
+import time
+
+import pytest
+from pymongo import _csot
+from pymongo.errors import BulkWriteError, NetworkTimeout
+
+import database
+from database import SyncError, sync_biomass_records
+
+
+OWNER = "owner-1"
+
+
+class FlakyCollection:
+    """Wraps a collection; the `fail_call`-th bulk_write rejects the op at `fail_index`."""
+
+    def __init__(self, col, fail_call, fail_index):
+        self.col = col
+        self.fail_call = fail_call
+        self.fail_index = fail_index
+        self.calls = 0
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls += 1
+        if self.calls != self.fail_call:
+            return self.col.bulk_write(ops, ordered=ordered)
+        # Unordered: every other op is applied, only one is rejected
+        self.col.bulk_write([op for k, op in enumerate(ops) if k != self.fail_index], ordered=False)
+        raise BulkWriteError({"writeErrors": [{"index": self.fail_index, "code": 121, "errmsg": "rejected"}]})
+
+
+def seed(n):
+    return [database.save_biomass_record(OWNER, i, i * 0.1, i * 0.01) for i in range(n)]
+
+
+def unsynced():
+    return database.get_conn().execute(
+        "SELECT COUNT(*) FROM biomass_records WHERE synced=0").fetchone()[0]
+
+
+def test_uploads_in_batches(local_db, cloud_db):
+    ids = seed(25)
+    col = cloud_db["biomassrecords"]
+    seen = []
+
+    assert sync_biomass_records(OWNER, batch_size=10, col=col, progress=seen.append) == 25
+    assert seen == [10, 20, 25]
+    assert col.count_documents({}) == 25
+    assert unsynced() == 0
+    assert database._get_checkpoint(local_db, OWNER) == ids[-1]
+
+
+def test_resumes_after_rejected_batch(local_db, cloud_db):
+    ids = seed(25)
+    col = cloud_db["biomassrecords"]
+    seen = []
+
+    with pytest.raises(SyncError) as err:
+        sync_biomass_records(OWNER, batch_size=10, col=FlakyCollection(col, 2, 3), progress=seen.append)
+    assert err.value.sent == 19
+    assert seen == [10, 19]                      # progress is reported for the partial batch
+    assert database._get_checkpoint(local_db, OWNER) == ids[12]  # just before the rejected row
+    assert unsynced() == 6                       # the rejected row and the unsent last batch
+
+    assert sync_biomass_records(OWNER, batch_size=10, col=col) == 6
+    assert unsynced() == 0
+    assert col.count_documents({}) == 25
+    assert len(col.distinct("recordId")) == 25
+
+
+def test_rerun_is_idempotent(local_db, cloud_db):
+    seed(12)
+    col = cloud_db["biomassrecords"]
+    assert sync_biomass_records(OWNER, batch_size=5, col=col) == 12
+
+    # Crash between the upload and marking rows synced: everything is sent again
+    with local_db:
+        local_db.execute("UPDATE biomass_records SET synced=0")
+        local_db.execute("DELETE FROM sync_state")
+    assert sync_biomass_records(OWNER, batch_size=5, col=col) == 12
+    assert col.count_documents({}) == 12
+
+    assert sync_biomass_records(OWNER, batch_size=5, col=col) == 0
+    assert col.count_documents({}) == 12
+
+
+def test_connection_error_raises_without_marking(local_db):
+    seed(3)
+
+    class Down:
+        def bulk_write(self, ops, ordered=True):
+            raise ConnectionError("cluster unreachable")
+
+    with pytest.raises(SyncError) as err:
+        sync_biomass_records(OWNER, col=Down())
+    assert err.value.sent == 0
+    assert unsynced() == 3
+
+
+def test_service_backs_off_on_write_errors(monkeypatch):
+    sync_service = pytest.importorskip("sync_service")
+    monkeypatch.setattr(sync_service, "cloud_available", lambda: True)
+    monkeypatch.setattr(sync_service.random, "uniform", lambda a, b: 1.0)
+
+    def rejected(progress):
+        raise SyncError("1 record(s) rejected", 4)
+
+    service = sync_service.SyncService(interval=300, base_delay=5)
+    service.tasks = [rejected]
+    delays, cycles = [], []
+    service.cycle_done.connect(cycles.append)
+
+    def sleep(seconds):
+        delays.append(seconds)
+        service.running = len(delays) < 3
+    monkeypatch.setattr(service, "_sleep", sleep)
+    monkeypatch.setattr(sync_service, "close_conn", lambda: None)
+
+    service.run()  # called directly, on this thread
+    assert delays == [5, 10, 20]
+    assert cycles == [4, 4, 4]
+
+
+def test_batches_run_under_a_time_limit(local_db, monkeypatch):
+    seed(3)
+    monkeypatch.setattr(database, "MONGO_SYNC_TIMEOUT_MS", 1500)
+
+    class Stalled:
+        def bulk_write(self, ops, ordered=True):
+            remaining = _csot.remaining()  # deadline set by pymongo.timeout()
+            assert remaining is not None and 0 < remaining <= 1.5
+            raise NetworkTimeout("timed out")
+
+    with pytest.raises(SyncError):
+        sync_biomass_records(OWNER, col=Stalled())
+    assert unsynced() == 3
+
+
+def test_stop_does_not_wait_for_a_stalled_sync(monkeypatch):
+    sync_service = pytest.importorskip("sync_service")
+    monkeypatch.setattr(sync_service, "cloud_available", lambda: True)
+    monkeypatch.setattr(sync_service, "close_conn", lambda: None)
+    release = threading.Event()
+
+    service = sync_service.SyncService()
+    service.tasks = [lambda progress: release.wait(10) and 0]
+    service.start()
+    time.sleep(0.1)
+
+    start = time.perf_counter()
+    assert service.stop(timeout=0.3) is False
+    assert time.perf_counter() - start < 1.0
+    release.set()
+    assert service.wait(5000)
@@ -1,10 +1,20 @@
-import sys, cv2, datetime
+import sys, datetime, time, functools
 from PyQt5 import QtWidgets, QtGui, QtCore
 from compute import compute_feed
-from detector import ShrimpDetector
+from aggregator import CountAggregator
+from detector import get_detector, detector_ready, preload_detector
 from camera import Camera
 from database import save_biomass_record
 from theme import *
+from display import FrameConverter, VIDEO_SIZE
+import metrics
+
+# --- Live screen refresh rates (override per window via BiomassWindow args) ---
+VIDEO_FPS = 15      # max video repaints per second
+STATS_HZ = 2        # count/feed label refreshes per second
+
+# Counts repeat constantly frame to frame, so cache their feed breakdown
+feed_for_count = functools.lru_cache(maxsize=1024)(compute_feed)
 
 # --- Catch all unhandled exceptions in Qt ---
 def qt_exception_hook(exctype, value, traceback):
@@ -18,29 +28,90 @@ class VideoLabel(QtWidgets.QLabel):
         super().__init__()
         self.setAlignment(QtCore.Qt.AlignCenter)
         self.setStyleSheet("border: 3px solid #0077cc; border-radius: 10px; background-color: black;")
-        self.setFixedSize(880, 460)
+        self.setFixedSize(*VIDEO_SIZE)
+
+        self.converter = FrameConverter()
+        self.last_display_ms = 0.0
 
     def set_frame(self, frame):
+        """Show a BGR frame through the shared FrameConverter."""
         try:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            qimg = QtGui.QImage(rgb.data, w, h, ch * w, QtGui.QImage.Format_RGB888)
-            pix = QtGui.QPixmap.fromImage(qimg)
-            pix = pix.scaled(self.width(), self.height(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            self.setPixmap(pix)
+            start = time.perf_counter()
+            qimg = self.converter.convert(frame, self.width(), self.height())
+            self.setPixmap(QtGui.QPixmap.fromImage(qimg))
+            self.last_display_ms = (time.perf_counter() - start) * 1000
         except Exception as e:
             print("Error displaying frame:", e)
 
 
+class DetectionWorker(QtCore.QThread):
+    """
+    Runs capture -> preprocess -> infer -> postprocess off the GUI thread.
+    Without a detector it takes the shared one on first start, so waiting
+    for a model that is still loading never blocks the GUI.
+    """
+    result = QtCore.pyqtSignal(int, object)  # count, BGR overlay frame
+    status = QtCore.pyqtSignal(str)
+
+    def __init__(self, camera, detector=None):
+        super().__init__()
+        self.camera = camera
+        self.detector = detector
+        self.running = False
+        self.pending = False   # a result is queued but not yet shown by the UI
+        self.waits = 0         # loop passes spent waiting for the UI instead of inferring
+
+    def run(self):
+        self.running = True
+        self.pending = False
+        if self.detector is None:
+            if not detector_ready():
+                # Poll rather than block on the load, so stop() stays prompt
+                self.status.emit("Loading model...")
+                preload_detector()
+                while self.running and not detector_ready():
+                    self.msleep(50)
+                if not self.running:
+                    return
+                self.status.emit("Running...")
+            self.detector = get_detector()
+        while self.running:
+            # Backpressure: never queue more than one result for the UI, and
+            # don't pay for a capture + inference the UI would have to discard
+            if self.pending:
+                self.waits += 1
+                metrics.incr("ui.backpressure_waits")
+                self.msleep(2)
+                continue
+
+            frame = self.camera.get_frame()
+            if frame is None:
+                self.msleep(5)
+                continue
+            count, vis = self.detector.detect(frame)
+            self.pending = True
+            self.result.emit(count, vis)
+
+    def ack(self):
+        self.pending = False
+
+    def stop(self):
+        self.running = False
+        self.wait()
+
+
 class BiomassWindow(QtWidgets.QWidget):
-    def __init__(self, user_id, parent=None):
+    def __init__(self, user_id, parent=None, video_fps=VIDEO_FPS, stats_hz=STATS_HZ):
         super().__init__()
         self.parent = parent
         self.user_id = user_id
-        self.detector = ShrimpDetector()
-        self.camera = Camera()
+        self.video_interval = 1.0 / video_fps
+        self.last_video = 0.0
+        self.shown_count = None   # count currently on the labels
+        self.camera = Camera(threaded=True)
         self.running = False
         self.count = 0
+        self.counts = CountAggregator()  # sliding window of per-frame counts
 
         # --- Window setup ---
         self.setWindowFlag(QtCore.Qt.FramelessWindowHint)
@@ -53,7 +124,7 @@ class BiomassWindow(QtWidgets.QWidget):
         self.lblTitle.setStyleSheet("font-size:38px; font-weight:bold; margin-bottom:10px;")
 
         # --- Status indicator ---
-        self.lblStatus = QtWidgets.QLabel("Idle")
+        self.lblStatus = QtWidgets.QLabel("Idle" if detector_ready() else "Idle - loading model...")
         self.lblStatus.setAlignment(QtCore.Qt.AlignCenter)
         self.lblStatus.setStyleSheet("font-size:26px; margin-bottom:15px; color:#555;")
 
@@ -92,9 +163,15 @@ class BiomassWindow(QtWidgets.QWidget):
             btn_layout.addWidget(b)
         layout.addLayout(btn_layout)
 
-        # --- Timer ---
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_frame)
+        # --- Detection worker ---
+        self.worker = DetectionWorker(self.camera)
+        self.worker.result.connect(self.update_frame)
+        self.worker.status.connect(self.show_worker_status)
+
+        # --- Stats refresh runs on its own, slower clock than the video ---
+        self.statsTimer = QtCore.QTimer()
+        self.statsTimer.setInterval(int(1000 / stats_hz))
+        self.statsTimer.timeout.connect(self.refresh_stats)
 
         # --- Button connections ---
         self.btnStart.clicked.connect(self.start)
@@ -125,46 +202,73 @@ class BiomassWindow(QtWidgets.QWidget):
     def start(self):
         if not self.running:
             self.running = True
-            self.timer.start(100)
+            self.worker.start()
+            self.statsTimer.start()
             self.lblStatus.setText("Running...")
 
     def stop(self):
         if self.running:
             self.running = False
-            self.timer.stop()
+            self.worker.stop()
+            self.statsTimer.stop()
+            self.refresh_stats()
             self.lblStatus.setText("Stopped")
 
     def reset(self):
         self.running = False
-        self.timer.stop()
+        self.worker.stop()
+        self.statsTimer.stop()
         self.count = 0
+        self.shown_count = 0
+        self.counts.reset()
         self.lblCount.setText("Count: 0")
         self.lblFeed.setText("Biomass: 0.00g | Feed: 0.00g | Protein: 0.00g | Filler: 0.00g")
         self.lblStatus.setText("Idle")
         QtWidgets.QMessageBox.information(self, "Reset", "Process has been reset successfully.")
 
     def save(self):
-        b, f, p, fl = compute_feed(self.count)
-        save_biomass_record(self.user_id, self.count, b, f)
-        QtWidgets.QMessageBox.information(self, "Saved", "Process saved locally.")
+        # Save the window median rather than whatever the last frame saw
+        count = round(self.counts.median()) if len(self.counts) else self.count
+        lo, hi = self.counts.confidence_interval()
+        b, f, p, fl = feed_for_count(count)
+        save_biomass_record(self.user_id, count, b, f)
+        QtWidgets.QMessageBox.information(
+            self, "Saved",
+            f"Process saved locally.\nCount: {count} (95% CI {lo}-{hi} over {len(self.counts)} frames)"
+        )
         self.lblStatus.setText("Saved")
 
     def go_back(self):
-        self.timer.stop()
+        self.worker.stop()
+        self.statsTimer.stop()
         self.camera.release()
         if self.parent:
             self.parent.update_recent()
             self.parent.showFullScreen()
         self.close()
 
-    def update_frame(self):
-        frame = self.camera.get_frame()
-        if frame is None:
-            return
-        count, frame_rgb = self.detector.detect(frame)
+    def show_worker_status(self, text):
+        if self.running:
+            self.lblStatus.setText(text)
+
+    def update_frame(self, count, vis):
+        if not self.running:
+            return  # late result from a stopped worker
         self.count = count
-        b, f, p, fl = compute_feed(count)
-        self.lblCount.setText(f"Count: {count}")
+        self.counts.add(count)
+
+        now = time.monotonic()
+        if now - self.last_video >= self.video_interval:
+            self.last_video = now
+            self.video.set_frame(vis)
+        self.worker.ack()
+
+    def refresh_stats(self):
+        """Update the labels only when the count changed (each setText relayouts)."""
+        if self.count == self.shown_count:
+            return
+        self.shown_count = self.count
+        b, f, p, fl = feed_for_count(self.count)
+        self.lblCount.setText(f"Count: {self.count}")
         self.lblFeed.setText(f"Biomass: {b:.2f}g | Feed: {f:.2f}g | Protein: {p:.2f}g | Filler: {fl:.2f}g")
-        self.video.set_frame(cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR))
 
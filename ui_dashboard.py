@@ -0,0 +1,108 @@
+from PyQt5 import QtWidgets, QtCore
+from analytics import daily_totals, weekly_totals, summary
+from theme import *
+
+
+class DashboardWindow(QtWidgets.QWidget):
+    """Daily/weekly totals and trends, rendered from the biomass_daily rollup."""
+    def __init__(self, parent, user_id):
+        super().__init__()
+        self.parent = parent
+        self.user_id = user_id
+        self.setWindowFlag(QtCore.Qt.FramelessWindowHint)
+        self.setStyleSheet(f"background-color:{BG_COLOR}; color:{TEXT_COLOR}; font-family:{FONT_FAMILY};")
+        self.setWindowTitle("Biomass Dashboard")
+
+        # --- Title ---
+        self.lblTitle = QtWidgets.QLabel("Biomass Summary Dashboard")
+        self.lblTitle.setAlignment(QtCore.Qt.AlignCenter)
+        self.lblTitle.setStyleSheet("font-size:28px; font-weight:bold; margin-bottom:10px;")
+
+        # --- Last 7 days summary ---
+        self.lblSummary = QtWidgets.QLabel("")
+        self.lblSummary.setAlignment(QtCore.Qt.AlignCenter)
+        self.lblSummary.setWordWrap(True)
+        self.lblSummary.setStyleSheet("""
+            background-color: #f7fbff;
+            border: 2px solid #0077cc;
+            border-radius: 16px;
+            padding: 16px;
+            font-size:22px;
+        """)
+
+        # --- Daily / weekly tables ---
+        self.tabs = QtWidgets.QTabWidget()
+        self.tabs.setStyleSheet("QTabBar::tab { font-size:20px; padding:10px 20px; min-width:200px; }")
+        self.tblDaily = self.make_table("Day")
+        self.tblWeekly = self.make_table("Week of")
+        self.tabs.addTab(self.tblDaily, "Daily (14 days)")
+        self.tabs.addTab(self.tblWeekly, "Weekly (8 weeks)")
+
+        # --- Buttons ---
+        self.btnBack = QtWidgets.QPushButton("Back")
+        self.btnBack.setFixedHeight(70)
+        self.btnBack.setStyleSheet(f"""
+            QPushButton {{
+                background-color:{BTN_COLOR};
+                color:white;
+                border-radius:15px;
+                font-size:22px;
+                font-weight:bold;
+                padding:8px;
+            }}
+            QPushButton:pressed {{
+                background-color:#005fa3;
+            }}
+        """)
+        self.btnBack.clicked.connect(self.go_back)
+
+        # --- Main Layout ---
+        mainLayout = QtWidgets.QVBoxLayout(self)
+        mainLayout.setContentsMargins(40, 20, 40, 20)
+        mainLayout.setSpacing(15)
+        mainLayout.addWidget(self.lblTitle)
+        mainLayout.addWidget(self.lblSummary)
+        mainLayout.addWidget(self.tabs)
+        mainLayout.addWidget(self.btnBack)
+
+        self.refresh()
+
+    def make_table(self, first_header):
+        t = QtWidgets.QTableWidget(0, 6)
+        t.setHorizontalHeaderLabels([first_header, "Processes", "Shrimp", "Avg Count", "Biomass (g)", "Feed (g)"])
+        t.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        t.verticalHeader().setVisible(False)
+        t.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        t.setStyleSheet("font-size:20px; background-color:white;")
+        return t
+
+    def fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for r, (label, records, count, biomass, feed, avg) in enumerate(rows):
+            cells = [label, str(records), str(count), f"{avg:.1f}", f"{biomass:.3f}", f"{feed:.3f}"]
+            for c, text in enumerate(cells):
+                item = QtWidgets.QTableWidgetItem(text)
+                item.setTextAlignment(QtCore.Qt.AlignCenter)
+                table.setItem(r, c, item)
+
+    def refresh(self):
+        s = summary(self.user_id)
+        trend = s["avg_count_trend_pct"]
+        if trend is None:
+            trend_text = "no data for the previous week"
+        else:
+            arrow = "▲" if trend >= 0 else "▼"
+            trend_text = f"{arrow} {abs(trend):.1f}% vs previous week"
+        self.lblSummary.setText(
+            f"<b>Last 7 days:</b> {s['records']} process(es)<br>"
+            f"<b>Biomass:</b> {s['total_biomass']:.3f} g | "
+            f"<b>Feed:</b> {s['total_feed']:.3f} g | "
+            f"<b>Average count:</b> {s['avg_count']:.1f} "
+            f"<span style='color:#666;'>({trend_text})</span>"
+        )
+        self.fill_table(self.tblDaily, daily_totals(self.user_id))
+        self.fill_table(self.tblWeekly, weekly_totals(self.user_id))
+
+    def go_back(self):
+        self.parent.showFullScreen()
+        self.close()
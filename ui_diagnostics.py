@@ -0,0 +1,110 @@
+from PyQt5 import QtWidgets, QtCore
+import metrics
+from theme import *
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+class DiagnosticsWindow(QtWidgets.QWidget):
+    """Hidden screen listing the live metrics (open with Ctrl+Shift+D or five taps on the menu title)."""
+    def __init__(self, parent, refresh_ms=1000):
+        super().__init__()
+        self.parent = parent
+        self.setWindowFlag(QtCore.Qt.FramelessWindowHint)
+        self.setStyleSheet(f"background-color:{BG_COLOR}; color:{TEXT_COLOR}; font-family:{FONT_FAMILY};")
+        self.setWindowTitle("Diagnostics")
+
+        # --- Title / status ---
+        self.lblTitle = QtWidgets.QLabel("Diagnostics")
+        self.lblTitle.setAlignment(QtCore.Qt.AlignCenter)
+        self.lblTitle.setStyleSheet("font-size:28px; font-weight:bold; margin-bottom:10px;")
+
+        self.lblStatus = QtWidgets.QLabel("")
+        self.lblStatus.setAlignment(QtCore.Qt.AlignCenter)
+        self.lblStatus.setStyleSheet("font-size:18px; color:#666;")
+
+        # --- Tables ---
+        self.tblHist = QtWidgets.QTableWidget(0, 8)
+        self.tblHist.setHorizontalHeaderLabels(["Metric", "Count", "Mean", "Min", "p50", "p95", "p99", "Max"])
+        self.tblCounters = QtWidgets.QTableWidget(0, 2)
+        self.tblCounters.setHorizontalHeaderLabels(["Counter", "Value"])
+        for t in (self.tblHist, self.tblCounters):
+            t.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+            t.verticalHeader().setVisible(False)
+            t.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+            t.setStyleSheet("font-size:18px; background-color:white;")
+
+        # --- Buttons ---
+        self.btnReset = self.make_button("Reset", BTN_DANGER)
+        self.btnBack = self.make_button("Back", BTN_COLOR)
+        self.btnReset.clicked.connect(self.reset)
+        self.btnBack.clicked.connect(self.go_back)
+        buttonLayout = QtWidgets.QHBoxLayout()
+        buttonLayout.addWidget(self.btnReset)
+        buttonLayout.addWidget(self.btnBack)
+
+        # --- Main Layout ---
+        mainLayout = QtWidgets.QVBoxLayout(self)
+        mainLayout.setContentsMargins(40, 20, 40, 20)
+        mainLayout.setSpacing(15)
+        mainLayout.addWidget(self.lblTitle)
+        mainLayout.addWidget(self.lblStatus)
+        mainLayout.addWidget(self.tblHist, stretch=3)
+        mainLayout.addWidget(self.tblCounters, stretch=2)
+        mainLayout.addLayout(buttonLayout)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+        self.refresh()
+
+    def make_button(self, text, color):
+        b = QtWidgets.QPushButton(text)
+        b.setFixedHeight(70)
+        b.setStyleSheet(f"""
+            QPushButton {{
+                background-color:{color};
+                color:white;
+                border-radius:15px;
+                font-size:22px;
+                font-weight:bold;
+                padding:8px;
+            }}
+            QPushButton:pressed {{
+                background-color:#005fa3;
+            }}
+        """)
+        return b
+
+    def fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for r, cells in enumerate(rows):
+            for c, value in enumerate(cells):
+                item = QtWidgets.QTableWidgetItem(_fmt(value))
+                item.setTextAlignment(QtCore.Qt.AlignLeft if c == 0 else QtCore.Qt.AlignCenter)
+                table.setItem(r, c, item)
+
+    def refresh(self):
+        snap = metrics.snapshot()
+        state = "enabled" if metrics.enabled else "disabled (METRICS_ENABLED=0)"
+        self.lblStatus.setText(f"Metrics {state} | uptime {snap['uptime_s']:.0f}s | {snap['time']}")
+        self.fill_table(self.tblHist, [
+            (name, h["count"], h["mean"], h["min"], h["p50"], h["p95"], h["p99"], h["max"])
+            for name, h in sorted(snap["histograms"].items())
+        ])
+        self.fill_table(self.tblCounters, sorted(snap["counters"].items()))
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def go_back(self):
+        self.timer.stop()
+        self.parent.showFullScreen()
+        self.close()
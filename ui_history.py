@@ -1,8 +1,168 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
-from database import get_all_records, delete_record, sync_biomass_records
+from database import (get_records_page, get_records_by_ids, delete_records, sync_biomass_records,
+                      add_change_listener, remove_change_listener, SyncError)
+from sync_service import get_sync_service
 from theme import *
 import datetime
 
+RecordRole = QtCore.Qt.UserRole + 1
+
+
+class HistoryModel(QtCore.QAbstractTableModel):
+    """
+    A user's biomass records, newest first, fetched page by page as the view
+    scrolls (keyset pagination on id). Only fetched pages are held in memory.
+    """
+    PAGE_SIZE = 50
+
+    def __init__(self, user_id, parent=None):
+        super().__init__(parent)
+        self.user_id = user_id
+        self.rows = []          # (id, count, biomass, feed, date_str, synced)
+        self.exhausted = False
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        if role == RecordRole:
+            return row
+        if role == QtCore.Qt.DisplayRole:
+            return f"Process on {row[4]}"
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+        before = self.rows[-1][0] if self.rows else None
+        page = get_records_page(self.user_id, before, self.PAGE_SIZE)
+        if len(page) < self.PAGE_SIZE:
+            self.exhausted = True
+        if not page:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(page) - 1)
+        self.rows.extend(self.to_row(rec) for rec in page)
+        self.endInsertRows()
+
+    # --- Helpers ---
+    @staticmethod
+    def to_row(rec):
+        """Pre-format a biomass_records row once, so painting stays cheap."""
+        date_str = datetime.datetime.fromisoformat(rec[6]).strftime("%B %d, %Y • %I:%M %p")
+        return (rec[0], rec[3], rec[4], rec[5], date_str, rec[7])
+
+    def reload(self):
+        self.beginResetModel()
+        self.rows = []
+        self.exhausted = False
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def record_id(self, index):
+        return self.rows[index.row()][0]
+
+    # --- Incremental updates from database change events ---
+    def find_row(self, rid):
+        """Row index of a record id, or -1 (rows are sorted by id, descending)."""
+        lo, hi = 0, len(self.rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.rows[mid][0] > rid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self.rows) and self.rows[lo][0] == rid else -1
+
+    def apply_change(self, kind, ids):
+        if kind == "inserted":
+            # New records are newer than anything shown; older ones arrive with fetchMore
+            newest = self.rows[0][0] if self.rows else 0
+            ids = [i for i in ids if i > newest] if self.rows or self.exhausted else []
+            recs = get_records_by_ids(self.user_id, ids)
+            if recs:
+                self.beginInsertRows(QtCore.QModelIndex(), 0, len(recs) - 1)
+                self.rows[0:0] = [self.to_row(rec) for rec in recs]
+                self.endInsertRows()
+        elif kind == "deleted":
+            for row in sorted((self.find_row(i) for i in ids), reverse=True):
+                if row >= 0:
+                    self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                    del self.rows[row]
+                    self.endRemoveRows()
+        elif kind == "synced":
+            for i in ids:
+                row = self.find_row(i)
+                if row >= 0 and not self.rows[row][5]:
+                    self.rows[row] = self.rows[row][:5] + (1,)
+                    idx = self.index(row, 0)
+                    self.dataChanged.emit(idx, idx, [RecordRole])
+
+
+class RecordCardDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a history card per row instead of building widgets for it."""
+    CARD_HEIGHT = 190
+    MARGIN = 8
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(option.rect.width(), self.CARD_HEIGHT + 2 * self.MARGIN)
+
+    def paint(self, painter, option, index):
+        rid, count, biomass, feed, date_str, synced = index.data(RecordRole)
+        selected = bool(option.state & QtWidgets.QStyle.State_Selected)
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+        # Base colors
+        border_color = "#4CAF50" if synced else "#ff9800"
+        bg_color = "#e8f5e9" if synced else "#fff5e6"
+        if selected:
+            border_color, bg_color = "#0078D7", "#f1faff"
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtGui.QPen(QtGui.QColor(border_color), 4 if selected else 2))
+        painter.setBrush(QtGui.QColor(bg_color))
+        painter.drawRoundedRect(rect, 12, 12)
+
+        text = rect.adjusted(18, 14, -18, -14)
+        font = QtGui.QFont(FONT_FAMILY)
+        font.setPixelSize(22)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor("#0077cc"))
+        painter.drawText(text.x(), text.y(), text.width(), 30, QtCore.Qt.AlignLeft, f"Process on {date_str}")
+
+        font.setPixelSize(20)
+        font.setBold(False)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(TEXT_COLOR))
+        lines = [
+            f"Shrimp Count: {count}",
+            f"Biomass: {biomass:.3f} g",
+            f"Feed Measurement: {feed:.3f} g",
+            f"Status: {'Synced' if synced else 'Not Synced'}",
+        ]
+        for i, line in enumerate(lines):
+            painter.drawText(text.x(), text.y() + 36 + i * 30, text.width(), 28, QtCore.Qt.AlignLeft, line)
+        painter.restore()
+
+
+class RecordChanges(QtCore.QObject):
+    """Carries database change events (from any thread) to the GUI thread."""
+    changed = QtCore.pyqtSignal(str, str, list)  # kind, owner id, record ids
+
+
 class HistoryWindow(QtWidgets.QWidget):
     def __init__(self, parent, user_id):
         super().__init__()
@@ -17,15 +177,25 @@ class HistoryWindow(QtWidgets.QWidget):
         self.lblTitle.setAlignment(QtCore.Qt.AlignCenter)
         self.lblTitle.setStyleSheet("font-size:28px; font-weight:bold; margin-bottom:10px;")
 
-        # --- Scroll area for record cards ---
-        self.scrollArea = QtWidgets.QScrollArea()
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setStyleSheet("border: none;")
+        # --- Background sync status ---
+        self.lblSync = QtWidgets.QLabel("")
+        self.lblSync.setAlignment(QtCore.Qt.AlignCenter)
+        self.lblSync.setStyleSheet("font-size:20px; color:#555;")
 
-        self.recordsContainer = QtWidgets.QWidget()
-        self.vboxRecords = QtWidgets.QVBoxLayout(self.recordsContainer)
-        self.vboxRecords.setAlignment(QtCore.Qt.AlignTop)
-        self.scrollArea.setWidget(self.recordsContainer)
+        # --- Record list: lazily paged model, cards painted by a delegate ---
+        self.model = HistoryModel(user_id, self)
+        self.listView = QtWidgets.QListView()
+        self.listView.setModel(self.model)
+        self.listView.setItemDelegate(RecordCardDelegate(self.listView))
+        self.listView.setUniformItemSizes(True)
+        self.listView.setSelectionMode(QtWidgets.QAbstractItemView.MultiSelection)  # tap to toggle
+        self.listView.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.listView.setStyleSheet("border: none;")
+        QtWidgets.QScroller.grabGesture(self.listView.viewport(), QtWidgets.QScroller.LeftMouseButtonGesture)
+
+        self.lblEmpty = QtWidgets.QLabel("No biomass records available.")
+        self.lblEmpty.setAlignment(QtCore.Qt.AlignCenter)
+        self.lblEmpty.setStyleSheet("font-size:22px; margin-top:200px; color:#888;")
 
         # --- Buttons ---
         self.btnSync = self.make_button("Sync to Cloud", BTN_SYNC)
@@ -43,7 +213,9 @@ class HistoryWindow(QtWidgets.QWidget):
         mainLayout.setContentsMargins(40, 20, 40, 20)
         mainLayout.setSpacing(15)
         mainLayout.addWidget(self.lblTitle)
-        mainLayout.addWidget(self.scrollArea)
+        mainLayout.addWidget(self.lblSync)
+        mainLayout.addWidget(self.listView)
+        mainLayout.addWidget(self.lblEmpty)
         mainLayout.addLayout(btnLayout)
 
         # --- Connect buttons ---
@@ -51,8 +223,18 @@ class HistoryWindow(QtWidgets.QWidget):
         self.btnDelete.clicked.connect(self.delete_selected)
         self.btnBack.clicked.connect(self.go_back)
 
-        self.selectedRecordId = None
-        self.selectedCard = None
+        # --- Sync service signals (sync never runs on the UI thread) ---
+        self.syncService = get_sync_service()
+        if self.syncService:
+            self.syncService.status.connect(self.lblSync.setText)
+            self.syncService.progress.connect(self.on_sync_progress)
+
+        # --- Patch only the affected rows when records change ---
+        self.changes = RecordChanges(self)
+        self.changes.changed.connect(self.on_records_changed)
+        self.changeListener = self.changes.changed.emit
+        add_change_listener(self.changeListener)
+
         self.load_records()
 
     def make_button(self, text, color):
@@ -74,115 +256,61 @@ class HistoryWindow(QtWidgets.QWidget):
         return b
 
     def load_records(self):
-        """Load all records into styled cards instead of a table."""
-        for i in reversed(range(self.vboxRecords.count())):
-            widget = self.vboxRecords.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-
-        records = get_all_records(self.user_id)
-        if not records:
-            noData = QtWidgets.QLabel("No biomass records available.")
-            noData.setAlignment(QtCore.Qt.AlignCenter)
-            noData.setStyleSheet("font-size:22px; margin-top:200px; color:#888;")
-            self.vboxRecords.addWidget(noData)
-            return
-
-        for rec in reversed(records):  # show newest first
-            recordCard = self.create_record_card(rec)
-            self.vboxRecords.addWidget(recordCard)
-
-    def create_record_card(self, rec):
-        """Create a single history record card."""
-        card = QtWidgets.QFrame()
-        card.setObjectName(str(rec[0]))  # store local ID
-        card.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-
-        synced = rec[7]
-        shrimpCount, biomass, feed, date = rec[3], rec[4], rec[5], rec[6]
-        date_str = datetime.datetime.fromisoformat(date).strftime("%B %d, %Y • %I:%M %p")
-
-        # Base colors
-        border_color = "#4CAF50" if synced else "#ff9800"
-        bg_color = "#e8f5e9" if synced else "#fff5e6"
-
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg_color};
-                border: 2px solid {border_color};
-                border-radius: 12px;
-                padding: 18px;
-                transition: all 0.3s ease;
-            }}
-            QFrame:hover {{
-                background-color: #f1faff;
-            }}
-        """)
-
-        layout = QtWidgets.QVBoxLayout(card)
-        layout.setSpacing(5)
-
-        title = QtWidgets.QLabel(f"Process on {date_str}")
-        title.setStyleSheet("font-size:22px; font-weight:bold; color:#0077cc;")
-
-        lblCount = QtWidgets.QLabel(f"Shrimp Count: {shrimpCount}")
-        lblBiomass = QtWidgets.QLabel(f"Biomass: {biomass:.3f} g")
-        lblFeed = QtWidgets.QLabel(f"Feed Measurement: {feed:.3f} g")
-        lblSync = QtWidgets.QLabel(f"Status: {'Synced' if synced else 'Not Synced'}")
-
-        for lbl in [lblCount, lblBiomass, lblFeed, lblSync]:
-            lbl.setStyleSheet("font-size:20px;")
+        """Reset the list to its first page; later pages load as the user scrolls."""
+        self.model.reload()
+        self.update_empty()
 
-        layout.addWidget(title)
-        layout.addWidget(lblCount)
-        layout.addWidget(lblBiomass)
-        layout.addWidget(lblFeed)
-        layout.addWidget(lblSync)
+    def update_empty(self):
+        empty = self.model.rowCount() == 0
+        self.lblEmpty.setVisible(empty)
+        self.listView.setVisible(not empty)
 
-        # Card click event
-        card.mousePressEvent = lambda event, rid=rec[0], c=card: self.select_record(rid, c)
+    def on_records_changed(self, kind, owner_id, ids):
+        if owner_id == self.user_id:
+            self.model.apply_change(kind, ids)
+            self.update_empty()
 
-        return card
-
-    def select_record(self, record_id, card_widget):
-        """Visually highlight selected card and remember ID for deletion."""
-        # Reset previous selection
-        if self.selectedCard:
-            # Remove the blue glow from previously selected card
-            self.selectedCard.setGraphicsEffect(None)
-
-        # Apply a glowing blue shadow effect to the new selection
-        shadow = QtWidgets.QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(25)
-        shadow.setColor(QtGui.QColor("#0078D7"))
-        shadow.setOffset(0, 0)
-        card_widget.setGraphicsEffect(shadow)
-
-        # Store selected record info
-        self.selectedRecordId = record_id
-        self.selectedCard = card_widget
+    def selected_ids(self):
+        return [self.model.record_id(i) for i in self.listView.selectionModel().selectedRows()]
 
     def sync_data(self):
-        synced_count = sync_biomass_records(self.user_id)
+        if self.syncService:
+            self.lblSync.setText("Sync requested...")
+            self.syncService.sync_now()
+            return
+        try:
+            synced_count = sync_biomass_records(self.user_id)
+        except SyncError as e:
+            QtWidgets.QMessageBox.warning(
+                self, "Sync Incomplete", f"{e.sent} record(s) synced before the sync stopped:\n{e}")
+            return
         QtWidgets.QMessageBox.information(self, "Sync Complete", f"{synced_count} record(s) synced to MongoDB Atlas.")
-        self.load_records()
+
+    def on_sync_progress(self, n):
+        self.lblSync.setText(f"Syncing... {n} record(s) sent")
 
     def delete_selected(self):
-        if not self.selectedRecordId:
+        ids = self.selected_ids()
+        if not ids:
             QtWidgets.QMessageBox.warning(self, "Delete Record", "Please select a record to delete first.")
             return
 
+        n = len(ids)
         confirm = QtWidgets.QMessageBox.question(
-            self, "Confirm Delete", "Are you sure you want to delete this record?",
+            self, "Confirm Delete", f"Are you sure you want to delete {n} record(s)?",
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
         )
         if confirm == QtWidgets.QMessageBox.Yes:
-            delete_record(self.selectedRecordId, self.user_id)
-            self.selectedRecordId = None
-            self.selectedCard = None
-            self.load_records()
+            # One local transaction; cloud deletes go out with the next background sync
+            delete_records(ids, self.user_id)  # the model drops the rows via change events
+            if self.syncService:
+                self.syncService.sync_now()
 
     def go_back(self):
+        remove_change_listener(self.changeListener)
+        if self.syncService:
+            self.syncService.status.disconnect(self.lblSync.setText)
+            self.syncService.progress.disconnect(self.on_sync_progress)
         self.parent.update_recent()
         self.parent.showFullScreen()
         self.close()
@@ -1,6 +1,9 @@
-from PyQt5 import QtWidgets, QtCore
+import time
+from PyQt5 import QtWidgets, QtCore, QtGui
 from ui_biomass import BiomassWindow
 from ui_history import HistoryWindow
+from ui_dashboard import DashboardWindow
+from ui_diagnostics import DiagnosticsWindow
 from database import get_last_record
 from theme import *
 
@@ -52,6 +55,7 @@ class MainMenu(QtWidgets.QWidget):
         # --- Buttons (bottom row) ---
         self.btnStart = self.make_button("Start Biomass Calculation", BTN_SYNC)
         self.btnHistory = self.make_button("View History", BTN_COLOR)
+        self.btnDashboard = self.make_button("Dashboard", BTN_COLOR)
         self.btnLogout = self.make_button("Logout", BTN_DANGER)
 
         buttonLayout = QtWidgets.QHBoxLayout()
@@ -59,6 +63,7 @@ class MainMenu(QtWidgets.QWidget):
         buttonLayout.setContentsMargins(60, 20, 60, 40)
         buttonLayout.addWidget(self.btnStart, stretch=1)
         buttonLayout.addWidget(self.btnHistory, stretch=1)
+        buttonLayout.addWidget(self.btnDashboard, stretch=1)
         buttonLayout.addWidget(self.btnLogout, stretch=1)
 
         # --- Main Layout ---
@@ -74,8 +79,14 @@ class MainMenu(QtWidgets.QWidget):
         # --- Connections ---
         self.btnStart.clicked.connect(self.open_biomass)
         self.btnHistory.clicked.connect(self.open_history)
+        self.btnDashboard.clicked.connect(self.open_dashboard)
         self.btnLogout.clicked.connect(self.logout)
 
+        # --- Hidden diagnostics: Ctrl+Shift+D, or five quick taps on the title ---
+        self.titleTaps = []
+        self.lblTitle.installEventFilter(self)
+        QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+Shift+D"), self, activated=self.open_diagnostics)
+
         # --- Load last process ---
         self.update_recent()
 
@@ -123,6 +134,25 @@ class MainMenu(QtWidgets.QWidget):
         self.hw.showFullScreen()
         self.hide()
 
+    def open_dashboard(self):
+        self.dw = DashboardWindow(self, self.user_id)
+        self.dw.showFullScreen()
+        self.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.lblTitle and event.type() == QtCore.QEvent.MouseButtonPress:
+            now = time.monotonic()
+            self.titleTaps = [t for t in self.titleTaps if now - t < 3.0] + [now]
+            if len(self.titleTaps) >= 5:
+                self.titleTaps = []
+                self.open_diagnostics()
+        return super().eventFilter(obj, event)
+
+    def open_diagnostics(self):
+        self.diag = DiagnosticsWindow(self)
+        self.diag.showFullScreen()
+        self.hide()
+
     def logout(self):
         self.logout_requested = True
         self.close()